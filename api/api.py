@@ -1,20 +1,28 @@
-import os
 import re
-import time
+import json
+import asyncio
+import hashlib
 import requests
 from typing import Dict, List, Optional
 from datetime import datetime
-from dotenv import load_dotenv
-
-load_dotenv()
-
-API_BASE_URL = os.getenv("API_BASE_URL")
-API_KEY = os.getenv("API_KEY")
-AFFILIATE_ID = os.getenv("AFFILIATE_ID")
+from api.retry import retry_policy
+from api.scheduler import scheduler
+from api.ratecache import RatesCache
+from api.ordercache import OrderStatusCache
+from api.ratesnapshot import RatesSnapshot
+from config.settings import API_BASE_URL, API_KEY, AFFILIATE_ID, RATES_CACHE_TTL, ORDER_CACHE_TTL, RATES_SNAPSHOT_DIR
 
 if not API_BASE_URL:
     raise ValueError("API_BASE_URL must be set in the .env file")
 
+REQUEST_TIMEOUT = 10
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+GET_HEADERS = {"X-Requested-With": "XMLHttpRequest"}
+POST_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded",
+    "X-Requested-With": "XMLHttpRequest"
+}
+
 ADDRESS_PATTERNS = {
     "BTC": r"^(?:[13][a-km-zA-HJ-NP-Z1-9]{25,34}|bc1[a-z0-9]{39,59})$",
     "BTCLN": r"^ln[a-z0-9]{20,}$",
@@ -31,35 +39,88 @@ def validate_address(currency: str, address: str) -> bool:
     pattern = ADDRESS_PATTERNS.get(currency, r".*")
     return bool(re.match(pattern, address.strip()))
 
-def get_rates(rate_mode: str = "dynamic") -> Dict:
-    try:
-        response = requests.get(
-            f"{API_BASE_URL}/rates",
-            params={"rate_mode": rate_mode, "api_key": API_KEY},
-            headers={"X-Requested-With": "XMLHttpRequest"}
+ORDER_ID_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+def validate_order_id(order_id: str) -> bool:
+    return bool(re.match(ORDER_ID_PATTERN, order_id))
+
+async def _send(method: str, path: str, params: Dict) -> requests.Response:
+    def call():
+        response = requests.request(
+            method,
+            f"{API_BASE_URL}{path}",
+            params=params if method == "GET" else None,
+            data=params if method == "POST" else None,
+            headers=GET_HEADERS if method == "GET" else POST_HEADERS,
+            timeout=REQUEST_TIMEOUT
         )
         response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return response
+    await scheduler.acquire()
+    return await asyncio.to_thread(call)
+
+async def _get(path: str, params: Dict) -> requests.Response:
+    params = {**params, "api_key": API_KEY}
+    return await retry_policy.run(lambda: _send("GET", path, params), f"GET {path}")
+
+async def _download(path: str, params: Dict, dest_path: str) -> Dict:
+    def call():
+        digest = hashlib.sha256()
+        size = 0
+        with requests.get(
+            f"{API_BASE_URL}{path}",
+            params={**params, "api_key": API_KEY},
+            headers=GET_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            with open(dest_path, "wb") as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            return {"content_type": response.headers.get("Content-Type", ""), "sha256": digest.hexdigest(), "size": size}
+
+    async def attempt():
+        await scheduler.acquire()
+        return await asyncio.to_thread(call)
+    return await retry_policy.run(attempt, f"GET {path}")
+
+async def _post(path: str, data: Dict) -> requests.Response:
+    return await _send("POST", path, {**data, "api_key": API_KEY})
+
+def _parse(response: requests.Response):
+    data = response.json()
+    if "error" in data:
+        raise ValueError(data["error"])
+    return data
+
+async def get_rates(rate_mode: str = "dynamic") -> Dict:
+    try:
+        return _parse(await _get("/rates", {"rate_mode": rate_mode}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to fetch rates: {str(e)}")
 
-def get_reserves() -> Dict:
-    try:
-        rates = get_rates("dynamic")
-        reserves = {}
-        for pair, info in rates.items():
-            _, to_currency = pair.split("_")
-            reserves[to_currency] = max(reserves.get(to_currency, 0), float(info["reserve"]))
-        return reserves
-    except Exception as e:
-        raise ValueError(f"Failed to fetch reserves: {str(e)}")
+def compute_reserves(rates: Dict) -> Dict:
+    reserves = {}
+    for pair, info in rates.items():
+        _, to_currency = pair.split("_")
+        reserves[to_currency] = max(reserves.get(to_currency, 0), float(info["reserve"]))
+    return reserves
+
+rates_snapshot = RatesSnapshot(
+    RATES_SNAPSHOT_DIR, get_rates, RATES_CACHE_TTL, lambda rates: {"reserves": compute_reserves(rates)}
+) if RATES_SNAPSHOT_DIR else None
+rates_cache = RatesCache(rates_snapshot.fetch if rates_snapshot else get_rates, RATES_CACHE_TTL)
+
+def reserves_for(rates: Dict) -> Dict:
+    reserves = rates_snapshot.table("dynamic", "reserves", rates) if rates_snapshot else None
+    return reserves if reserves is not None else compute_reserves(rates)
 
-def get_pair_info(from_currency: str, to_currency: str, rate_mode: str = "dynamic") -> Dict:
+async def get_pair_info(from_currency: str, to_currency: str, rate_mode: str = "dynamic") -> Dict:
     try:
-        rates = get_rates(rate_mode)
+        rates = await rates_cache.get(rate_mode)
         pair_key = f"{from_currency}_{to_currency}"
         if pair_key not in rates:
             raise ValueError(f"Pair {from_currency} to {to_currency} not supported")
@@ -71,39 +132,21 @@ def get_pair_info(from_currency: str, to_currency: str, rate_mode: str = "dynami
     except Exception as e:
         raise ValueError(f"Failed to fetch pair info: {str(e)}")
 
-def get_volume() -> Optional[Dict]:
+async def get_volume() -> Optional[Dict]:
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/volume",
-            params={"api_key": API_KEY},
-            headers={"X-Requested-With": "XMLHttpRequest"}
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _get("/volume", {}))
     except requests.RequestException as e:
         print(f"API /volume unavailable: {str(e)}")
         return None
 
-def get_status() -> Optional[Dict]:
+async def get_status() -> Optional[Dict]:
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/status",
-            params={"api_key": API_KEY},
-            headers={"X-Requested-With": "XMLHttpRequest"}
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _get("/status", {}))
     except requests.RequestException as e:
         print(f"API /status unavailable: {str(e)}")
         return None
 
-def create_exchange(from_currency: str, to_currency: str, to_address: str, amount: float, options: Dict = {}) -> Dict:
+async def create_exchange(from_currency: str, to_currency: str, to_address: str, amount: float, options: Dict = {}) -> Dict:
     refund_address = options.get("refund_address", "")
     rate_mode = options.get("rate_mode", "dynamic")
     fee_option = options.get("fee_option", "f")
@@ -111,204 +154,116 @@ def create_exchange(from_currency: str, to_currency: str, to_address: str, amoun
     aggregation = options.get("aggregation", "any")
 
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/create",
-            data={
-                "from_currency": from_currency,
-                "to_currency": to_currency,
-                "to_address": to_address,
-                "amount": amount,
-                "refund_address": refund_address,
-                "rate_mode": rate_mode,
-                "fee_option": fee_option,
-                "aggregation": aggregation,
-                "ref": ref,
-                "api_key": API_KEY
-            },
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _post("/create", {
+            "from_currency": from_currency,
+            "to_currency": to_currency,
+            "to_address": to_address,
+            "amount": amount,
+            "refund_address": refund_address,
+            "rate_mode": rate_mode,
+            "fee_option": fee_option,
+            "aggregation": aggregation,
+            "ref": ref
+        }))
     except requests.RequestException as e:
         raise ValueError(f"Failed to create exchange: {str(e)}")
 
-def get_order_status(order_id: str) -> Dict:
-    max_retries = 3
-    retry_delay = 2 
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = requests.get(
-                f"{API_BASE_URL}/order",
-                params={"orderid": order_id, "api_key": API_KEY},
-                headers={"X-Requested-With": "XMLHttpRequest"},
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            if "error" in data:
-                raise ValueError(data["error"])
-            return data
-        except requests.RequestException as e:
-            print(f"Attempt {attempt} failed for order {order_id}: {str(e)}")
-            if attempt == max_retries:
-                raise ValueError(f"Failed to fetch order status: {str(e)}")
-            time.sleep(retry_delay)
-
-def fetch_guarantee(order_id: str) -> bytes:
+async def _fetch_order_status(order_id: str) -> Dict:
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/order/fetch_guarantee",
-            params={"orderid": order_id, "api_key": API_KEY},
-            headers={"X-Requested-With": "XMLHttpRequest"}
-        )
-        response.raise_for_status()
-        return response.content
+        return _parse(await _get("/order", {"orderid": order_id}))
     except requests.RequestException as e:
-        raise ValueError(f"Failed to fetch guarantee: {str(e)}")
+        raise ValueError(f"Failed to fetch order status: {str(e)}")
+
+order_cache = OrderStatusCache(_fetch_order_status, ORDER_CACHE_TTL)
+
+async def get_order_status(order_id: str, max_age: Optional[float] = None) -> Dict:
+    return await order_cache.get(order_id, max_age)
 
-def request_refund(order_id: str) -> Dict:
+async def download_guarantee(order_id: str, dest_path: str) -> Dict:
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/order/refund",
-            data={"orderid": order_id, "api_key": API_KEY},
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
+        result = await _download("/order/fetch_guarantee", {"orderid": order_id}, dest_path)
+    except requests.RequestException as e:
+        raise ValueError(f"Failed to fetch guarantee: {str(e)}")
+    if "json" in result["content_type"]:
+        with open(dest_path, encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "error" in data:
             raise ValueError(data["error"])
-        return data
+    return result
+
+async def request_refund(order_id: str) -> Dict:
+    try:
+        return _parse(await _post("/order/refund", {"orderid": order_id}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to request refund: {str(e)}")
+    finally:
+        order_cache.invalidate(order_id)
 
-def confirm_refund(order_id: str, refund_address: str) -> Dict:
+async def confirm_refund(order_id: str, refund_address: str) -> Dict:
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/order/refund_confirm",
-            data={"orderid": order_id, "refund_address": refund_address, "api_key": API_KEY},
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _post("/order/refund_confirm", {"orderid": order_id, "refund_address": refund_address}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to confirm refund: {str(e)}")
+    finally:
+        order_cache.invalidate(order_id)
 
-def revalidate_address(order_id: str, to_address: str) -> Dict:
+async def revalidate_address(order_id: str, to_address: str) -> Dict:
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/order/revalidate_address",
-            data={"orderid": order_id, "to_address": to_address, "api_key": API_KEY},
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _post("/order/revalidate_address", {"orderid": order_id, "to_address": to_address}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to revalidate address: {str(e)}")
+    finally:
+        order_cache.invalidate(order_id)
 
-def remove_order(order_id: str) -> Dict:
+async def remove_order(order_id: str) -> Dict:
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/order/remove",
-            data={"orderid": order_id, "api_key": API_KEY},
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _post("/order/remove", {"orderid": order_id}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to remove order: {str(e)}")
+    finally:
+        order_cache.invalidate(order_id)
 
-def send_support_message(order_id: str, message: str) -> Dict:
+async def send_support_message(order_id: str, message: str) -> Dict:
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/order/support_message",
-            data={"orderid": order_id, "supportmessage": message, "api_key": API_KEY},
-            headers={
-                "Content-Type": "application/x-www-form-urlencoded",
-                "X-Requested-With": "XMLHttpRequest"
-            }
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _post("/order/support_message", {"orderid": order_id, "supportmessage": message}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to send support message: {str(e)}")
 
-def get_support_messages(order_id: str) -> List:
+async def get_support_messages(order_id: str) -> List:
     try:
-        response = requests.get(
-            f"{API_BASE_URL}/order/support_messages",
-            params={"orderid": order_id, "api_key": API_KEY},
-            headers={"X-Requested-With": "XMLHttpRequest"}
-        )
-        response.raise_for_status()
-        data = response.json()
-        if "error" in data:
-            raise ValueError(data["error"])
-        return data
+        return _parse(await _get("/order/support_messages", {"orderid": order_id}))
     except requests.RequestException as e:
         raise ValueError(f"Failed to fetch support messages: {str(e)}")
 
 def format_rates(data: Dict) -> str:
-    response = "💱 Exchange Rates\n\n"
+    lines = ["💱 Exchange Rates", ""]
     for pair, info in data.items():
         from_curr, to_curr = pair.split("_")
-        rate = float(info["rate"])
-        response += f"{from_curr} → {to_curr}: {rate:,.8f}\n"
-    return response.strip()
+        lines.append(f"{from_curr} → {to_curr}: {float(info['rate']):,.8f}")
+    return "\n".join(lines).strip()
 
 def format_reserves(data: Dict) -> str:
-    response = "📦 Currency Reserves\n\n"
-    for currency, reserve in data.items():
-        response += f"{currency}: {float(reserve):,.2f}\n"
-    return response.strip()
+    lines = ["📦 Currency Reserves", ""]
+    lines.extend(f"{currency}: {float(reserve):,.2f}" for currency, reserve in data.items())
+    return "\n".join(lines).strip()
 
 def format_volume(data: Optional[Dict]) -> str:
     if not data:
         return "📊 24-Hour Volume Unavailable\nContact support@exch.cx for assistance."
-    response = "📊 24-Hour Volume\n\n"
-    for currency, volume in data.items():
-        response += f"{currency}: {float(volume):,.2f}\n"
-    return response.strip()
+    lines = ["📊 24-Hour Volume", ""]
+    lines.extend(f"{currency}: {float(volume):,.2f}" for currency, volume in data.items())
+    return "\n".join(lines).strip()
 
 def format_status(data: Optional[Dict]) -> str:
     if not data:
         return "🌐 Network Status Unavailable\nContact support@exch.cx for assistance."
-    response = "🌐 Network Status\n\n"
+    lines = ["🌐 Network Status", ""]
     for network, info in data.items():
         line = f"{network}: {'Online ✅' if info['status'] == 'online' else 'Offline ❌'}"
         if info.get("aggregated_balance"):
             line += f" | Balance: {float(info['aggregated_balance']):,.2f}"
-        response += line + "\n"
-    return response.strip()
+        lines.append(line)
+    return "\n".join(lines).strip()
 
 def format_order_status(order_info: Dict) -> str:
     svc_fee_percent = float(order_info.get("svc_fee", 0))
@@ -343,14 +298,15 @@ def format_order_status(order_info: Dict) -> str:
         response += f"\n💸 Send {order_info['from_currency']} to: {order_info['from_addr']}\nMin: {min_input} {order_info['from_currency']} Max: {max_input} {order_info['from_currency']}"
     return response.strip()
 
-def format_support_messages(messages: List) -> str:
+def format_support_line(msg: Dict) -> str:
+    timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+    return f"[{timestamp}] {msg['sender']}: {msg['message']}"
+
+def format_support_lines(lines: List[str]) -> str:
     response = "💬 Support Chat\n\n"
-    if not messages:
+    if not lines:
         return response + "No messages yet. Start a chat with /support_message <order_id> <message>."
-    for msg in messages:
-        timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-        response += f"[{timestamp}] {msg['sender']}: {msg['message']}\n"
-    return response.strip()
+    return (response + "\n".join(lines)).strip()
 
 def extract_currencies(rates: Dict) -> List:
     currencies = set()
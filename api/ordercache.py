@@ -0,0 +1,40 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+class OrderStatusCache:
+    def __init__(self, fetch: Callable[[str], Awaitable[Dict]], ttl: float = 5.0, max_entries: int = 1000):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self.inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, order_id: str, max_age: Optional[float] = None) -> Dict:
+        entry = self.entries.get(order_id)
+        if entry and time.monotonic() - entry[0] < (self.ttl if max_age is None else max_age):
+            return entry[1]
+        task = self.inflight.get(order_id)
+        if not task:
+            task = asyncio.create_task(self.refresh(order_id))
+            self.inflight[order_id] = task
+        return await asyncio.shield(task)
+
+    async def refresh(self, order_id: str) -> Dict:
+        task = asyncio.current_task()
+        try:
+            data = await self.fetch(order_id)
+            if self.inflight.get(order_id) is task:
+                self.entries[order_id] = (time.monotonic(), data)
+                self.entries.move_to_end(order_id)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            return data
+        finally:
+            if self.inflight.get(order_id) is task:
+                del self.inflight[order_id]
+
+    def invalidate(self, order_id: str):
+        self.entries.pop(order_id, None)
+        self.inflight.pop(order_id, None)
@@ -0,0 +1,42 @@
+from typing import Dict, List, Sequence
+from api.api import rates_cache
+
+def quote_from_rates(rates: Dict, from_currency: str, to_currency: str, amounts: Sequence[float]) -> Dict:
+    pair = rates.get(f"{from_currency}_{to_currency}")
+    if not pair:
+        raise ValueError(f"Pair {from_currency} to {to_currency} not supported")
+    rate = float(pair["rate"])
+    fee = float(pair["svc_fee"])
+    reserve = float(pair["reserve"])
+    net_rate = rate * (1 - fee / 100)
+    return {
+        "rate": rate,
+        "fee": fee,
+        "reserve": reserve,
+        "max_amount": reserve / net_rate if net_rate > 0 else 0.0,
+        "quotes": [
+            {"amount": amount, "receive": amount * net_rate, "exceeds_reserve": amount * net_rate > reserve}
+            for amount in amounts
+        ]
+    }
+
+async def quote(from_currency: str, to_currency: str, amounts: Sequence[float],
+                rate_modes: Sequence[str] = ("flat", "dynamic")) -> Dict[str, Dict]:
+    result = {}
+    for rate_mode in rate_modes:
+        rates = rates_cache.peek(rate_mode) or await rates_cache.get(rate_mode)
+        result[rate_mode] = quote_from_rates(rates, from_currency, to_currency, amounts)
+    return result
+
+def format_quote(from_currency: str, to_currency: str, quotes: Dict[str, Dict]) -> str:
+    lines: List[str] = ["!2 Quote!", f"Pair: {from_currency} → {to_currency}"]
+    for rate_mode, info in quotes.items():
+        lines.append("")
+        lines.append(f"{rate_mode.capitalize()} Mode (1 {from_currency} = {info['rate']:.8f} {to_currency}, fee {info['fee']:.2f}%):")
+        for item in info["quotes"]:
+            warning = " ⚠️ exceeds reserve" if item["exceeds_reserve"] else ""
+            lines.append(f"{item['amount']:g} {from_currency} → {item['receive']:.8f} {to_currency}{warning}")
+        lines.append(f"Max by reserve: {info['max_amount']:.8f} {from_currency}")
+    lines.append("")
+    lines.append("_Estimate from cached rates after service fee; network fee not included._")
+    return "\n".join(lines)
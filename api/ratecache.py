@@ -0,0 +1,46 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+class RatesCache:
+    def __init__(self, fetch: Callable[[str], Awaitable[Dict]], ttl: float = 15.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.entries: Dict[str, Tuple[float, Dict]] = {}
+        self.inflight: Dict[str, asyncio.Task] = {}
+
+    def peek(self, rate_mode: str = "dynamic") -> Optional[Dict]:
+        entry = self.entries.get(rate_mode)
+        return entry[1] if entry else None
+
+    def age(self, rate_mode: str = "dynamic") -> Optional[float]:
+        entry = self.entries.get(rate_mode)
+        return time.monotonic() - entry[0] if entry else None
+
+    def store(self, rate_mode: str, data: Dict):
+        self.entries[rate_mode] = (time.monotonic(), data)
+
+    async def get(self, rate_mode: str = "dynamic", max_age: Optional[float] = None) -> Dict:
+        age = self.age(rate_mode)
+        if age is not None and age < (self.ttl if max_age is None else max_age):
+            return self.entries[rate_mode][1]
+        task = self.inflight.get(rate_mode)
+        if not task:
+            task = asyncio.create_task(self.refresh(rate_mode))
+            self.inflight[rate_mode] = task
+        return await asyncio.shield(task)
+
+    async def refresh(self, rate_mode: str) -> Dict:
+        try:
+            data = await self.fetch(rate_mode)
+            self.store(rate_mode, data)
+            return data
+        finally:
+            self.inflight.pop(rate_mode, None)
+
+    async def warm(self, *rate_modes: str):
+        rate_modes = rate_modes or ("dynamic",)
+        results = await asyncio.gather(*(self.get(mode) for mode in rate_modes), return_exceptions=True)
+        for mode, result in zip(rate_modes, results):
+            if isinstance(result, Exception):
+                print(f"Failed to warm {mode} rates: {str(result)}")
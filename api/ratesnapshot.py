@@ -0,0 +1,161 @@
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MAGIC = b"RSNP"
+HEADER = struct.Struct("<4sQdI")
+
+class RatesSnapshot:
+    def __init__(
+        self,
+        directory: str,
+        fetch: Callable[[str], Awaitable[Dict]],
+        ttl: float = 15.0,
+        derive: Optional[Callable[[Dict], Dict]] = None,
+        wait_timeout: float = 10.0
+    ):
+        self.directory = directory
+        self.upstream = fetch
+        self.ttl = ttl
+        self.derive = derive
+        self.wait_timeout = wait_timeout
+        self.maps: Dict[str, Tuple[str, mmap.mmap]] = {}
+        self.parsed: Dict[str, Tuple[int, float, Dict]] = {}
+        self.lock_files: Dict[str, object] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, rate_mode: str, version: int) -> str:
+        return os.path.join(self.directory, f"rates-{rate_mode}-{version:012d}.snap")
+
+    def versions(self, rate_mode: str) -> List[str]:
+        prefix = f"rates-{rate_mode}-"
+        return sorted(
+            name for name in os.listdir(self.directory) if name.startswith(prefix) and name.endswith(".snap")
+        )
+
+    def map_latest(self, rate_mode: str) -> Optional[mmap.mmap]:
+        for _ in range(3):
+            names = self.versions(rate_mode)
+            if not names:
+                return None
+            mapped = self.maps.get(rate_mode)
+            if mapped and mapped[0] == names[-1]:
+                return mapped[1]
+            try:
+                with open(os.path.join(self.directory, names[-1]), "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except FileNotFoundError:
+                continue
+            except ValueError:
+                return None
+            if mapped:
+                mapped[1].close()
+            self.maps[rate_mode] = (names[-1], mm)
+            return mm
+        return None
+
+    def header(self, rate_mode: str) -> Optional[Tuple[int, float, int]]:
+        mm = self.map_latest(rate_mode)
+        if mm is None:
+            return None
+        if len(mm) < HEADER.size:
+            return None
+        magic, version, fetched_at, length = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or len(mm) < HEADER.size + length:
+            return None
+        return version, fetched_at, length
+
+    def read(self, rate_mode: str) -> Optional[Tuple[int, float, Dict]]:
+        header = self.header(rate_mode)
+        if not header:
+            return None
+        version, fetched_at, length = header
+        cached = self.parsed.get(rate_mode)
+        if cached and cached[0] == version:
+            return cached
+        mm = self.maps[rate_mode][1]
+        payload = json.loads(mm[HEADER.size:HEADER.size + length])
+        self.parsed[rate_mode] = (version, fetched_at, payload)
+        return self.parsed[rate_mode]
+
+    def fresh(self, rate_mode: str) -> Optional[Dict]:
+        snapshot = self.read(rate_mode)
+        if snapshot and time.time() - snapshot[1] < self.ttl:
+            return snapshot[2]
+        return None
+
+    def publish(self, rate_mode: str, rates: Dict, version: int) -> Dict:
+        payload = {"rates": rates}
+        if self.derive:
+            payload.update(self.derive(rates))
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        path = self.path(rate_mode, version)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, version, time.time(), len(body)))
+            f.write(body)
+        os.replace(temp_path, path)
+        for name in self.versions(rate_mode)[:-2]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        return payload
+
+    def try_lock(self, rate_mode: str) -> bool:
+        if fcntl is None:
+            return True
+        lock_file = self.lock_files.get(rate_mode)
+        if lock_file is None:
+            lock_file = open(os.path.join(self.directory, f"rates-{rate_mode}.lock"), "a")
+            self.lock_files[rate_mode] = lock_file
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def unlock(self, rate_mode: str):
+        if fcntl is not None and rate_mode in self.lock_files:
+            fcntl.flock(self.lock_files[rate_mode], fcntl.LOCK_UN)
+
+    async def fetch(self, rate_mode: str) -> Dict:
+        payload = self.fresh(rate_mode)
+        if payload:
+            return payload["rates"]
+        if self.try_lock(rate_mode):
+            try:
+                payload = self.fresh(rate_mode)
+                if payload:
+                    return payload["rates"]
+                rates = await self.upstream(rate_mode)
+                header = self.header(rate_mode)
+                payload = await asyncio.to_thread(self.publish, rate_mode, rates, (header[0] if header else 0) + 1)
+                version, fetched_at, _ = self.header(rate_mode)
+                self.parsed[rate_mode] = (version, fetched_at, payload)
+                return payload["rates"]
+            finally:
+                self.unlock(rate_mode)
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            payload = self.fresh(rate_mode)
+            if payload:
+                return payload["rates"]
+        print(f"Rates snapshot for {rate_mode} not published by another process in time, fetching directly")
+        return await self.upstream(rate_mode)
+
+    def table(self, rate_mode: str, name: str, rates: Dict) -> Optional[Dict]:
+        cached = self.parsed.get(rate_mode)
+        if cached and cached[2]["rates"] is rates:
+            return cached[2].get(name)
+        return None
@@ -0,0 +1,65 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+from typing import List, Tuple
+from config.settings import API_MAX_RPS, API_BURST
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+def use_background_priority():
+    request_priority.set(BACKGROUND)
+
+class RequestScheduler:
+    def __init__(self, requests_per_second: float = 5.0, burst: int = 5):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.counter = itertools.count()
+        self.pump_task = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.requests_per_second)
+        self.last_refill = now
+
+    async def acquire(self, priority: int = None):
+        if priority is None:
+            priority = request_priority.get()
+        if self.requests_per_second <= 0:
+            return
+        self._refill()
+        if not self.waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.counter), future))
+        if not self.pump_task or self.pump_task.done():
+            self.pump_task = asyncio.create_task(self._pump())
+        await future
+
+    async def _pump(self):
+        while self.waiters:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.requests_per_second)
+                continue
+            _, _, future = heapq.heappop(self.waiters)
+            if future.done():
+                continue
+            self.tokens -= 1
+            future.set_result(None)
+
+    def queued(self) -> int:
+        return len(self.waiters)
+
+scheduler = RequestScheduler(
+    requests_per_second=API_MAX_RPS,
+    burst=API_BURST
+)
@@ -1,14 +1,12 @@
 import os
+import time
 import asyncio
 import socket
-import subprocess
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SIMPLEX_PATH = os.getenv("SIMPLEX_PATH")
-SIMPLEX_DB = os.getenv("SIMPLEX_DB")
-PORT = int(os.getenv("PORT", "8000"))
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from websocket.websock import connect_websocket, wait_for_port
+from websocket.recorder import EventRecorder
+from config.settings import SIMPLEX_PATH, SIMPLEX_DB, PORT, EVENT_LOG_DIR, EVENT_LOG_ANONYMIZE_KEY
 
 if not SIMPLEX_PATH or not SIMPLEX_DB:
     raise ValueError("SIMPLEX_PATH and SIMPLEX_DB must be set in the .env file")
@@ -25,28 +23,180 @@ async def check_port_in_use(port: int) -> bool:
     finally:
         sock.close()
 
-async def start_client(port: int = PORT) -> subprocess.Popen:
-    print(f"Starting SimpleX CLI on port {port}...")
-    command = f'"{SIMPLEX_PATH}" -d "{SIMPLEX_DB}" -p {port}'
-    print(f"Command: {command}")
-    process = subprocess.Popen(
-        command,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        shell=True,
-        text=True
-    )
-
-    async def log_output(stream, prefix):
-        while True:
-            line = await asyncio.get_event_loop().run_in_executor(None, stream.readline)
-            if not line:
+async def log_output(stream: asyncio.StreamReader, prefix: str):
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        print(f"{prefix}: {line.decode(errors='replace').strip()}")
+
+class CliSupervisor:
+    def __init__(self, port: int = PORT, db: str = SIMPLEX_DB, max_backoff: float = 30.0, stable_uptime: float = 60.0):
+        self.port = port
+        self.db = db
+        self.max_backoff = max_backoff
+        self.stable_uptime = stable_uptime
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at: Optional[float] = None
+        self.restarts = 0
+        self.stopping = False
+        self.monitor_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        await self.launch()
+        self.monitor_task = asyncio.create_task(self.monitor())
+
+    async def launch(self):
+        print(f"Starting SimpleX CLI on port {self.port}...")
+        print(f"Command: {SIMPLEX_PATH} -d {self.db} -p {self.port}")
+        self.process = await asyncio.create_subprocess_exec(
+            SIMPLEX_PATH, "-d", self.db, "-p", str(self.port),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self.started_at = time.monotonic()
+        asyncio.create_task(log_output(self.process.stdout, "CLI"))
+        asyncio.create_task(log_output(self.process.stderr, "CLI Error"))
+
+        ready = asyncio.create_task(wait_for_port(self.port))
+        exited = asyncio.create_task(self.process.wait())
+        await asyncio.wait({ready, exited}, return_when=asyncio.FIRST_COMPLETED)
+        exited.cancel()
+        if not ready.done():
+            ready.cancel()
+            raise ValueError(f"SimpleX CLI exited with code {self.process.returncode} before port {self.port} was ready")
+        ready.result()
+
+    async def monitor(self):
+        backoff = 1.0
+        while not self.stopping:
+            code = await self.process.wait()
+            if self.stopping:
                 break
-            print(f"{prefix}: {line.strip()}")
+            if time.monotonic() - self.started_at >= self.stable_uptime:
+                backoff = 1.0
+            print(f"SimpleX CLI on port {self.port} exited with code {code}, restarting in {backoff:.0f} seconds...")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+            try:
+                await self.launch()
+                self.restarts += 1
+                print(f"SimpleX CLI on port {self.port} restarted (restart #{self.restarts})")
+            except Exception as e:
+                print(f"Failed to restart SimpleX CLI on port {self.port}: {str(e)}")
+
+    async def stop(self, timeout: float = 10.0):
+        self.stopping = True
+        if self.monitor_task:
+            self.monitor_task.cancel()
+        if not self.alive:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+async def start_client(port: int = PORT, db: str = SIMPLEX_DB) -> CliSupervisor:
+    supervisor = CliSupervisor(port, db)
+    await supervisor.start()
+    return supervisor
+
+class InstanceSocket:
+    def __init__(self, ws, instance: "CliInstance"):
+        self.ws = ws
+        self.instance = instance
+
+    async def send(self, message: str):
+        self.instance.commands_sent += 1
+        await self.ws.send(message)
+
+class CliInstance:
+    def __init__(self, index: int, port: int, db: str):
+        self.index = index
+        self.port = port
+        self.db = db
+        self.supervisor: Optional[CliSupervisor] = None
+        self.ws: Optional[InstanceSocket] = None
+        self.events_received = 0
+        self.commands_sent = 0
+        self.last_event_time: Optional[float] = None
+        self.contacts: Set[int] = set()
+
+    @property
+    def alive(self) -> bool:
+        return self.supervisor is not None and self.supervisor.alive
+
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and getattr(self.ws.ws, "open", False)
+
+    async def start(self):
+        self.supervisor = await start_client(self.port, self.db)
+
+    async def run(self, message_handler, recorder: Optional[EventRecorder] = None):
+        async def handle(response: Dict, ws):
+            if not self.ws or self.ws.ws is not ws:
+                self.ws = InstanceSocket(ws, self)
+            self.events_received += 1
+            self.last_event_time = time.time()
+            contact = response.get("resp", {}).get("contact") or {}
+            chat_items = response.get("resp", {}).get("chatItems") or []
+            if chat_items:
+                contact = chat_items[0].get("chatInfo", {}).get("contact") or contact
+            if contact.get("contactId") is not None:
+                self.contacts.add(contact["contactId"])
+            await message_handler(response, self.ws)
+
+        await connect_websocket(self.port, handle, recorder=recorder)
+
+    def status(self) -> str:
+        health = "healthy" if self.alive and self.connected else "alive, not connected" if self.alive else "down"
+        last_event = f"{int(time.time() - self.last_event_time)}s ago" if self.last_event_time else "never"
+        restarts = self.supervisor.restarts if self.supervisor else 0
+        return (
+            f"#{self.index} port {self.port}: {health} | restarts {restarts} | contacts {len(self.contacts)} | "
+            f"events {self.events_received} | sent {self.commands_sent} | last event {last_event}"
+        )
+
+class CliPool:
+    def __init__(self, size: int, base_port: int = PORT, base_db: str = SIMPLEX_DB):
+        self.instances: List[CliInstance] = [
+            CliInstance(index, base_port + index, base_db if index == 0 else f"{base_db}_{index}")
+            for index in range(size)
+        ]
+        self.recorder: Optional[EventRecorder] = None
+        if EVENT_LOG_DIR:
+            self.recorder = EventRecorder(
+                os.path.join(EVENT_LOG_DIR, f"events-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"),
+                EVENT_LOG_ANONYMIZE_KEY
+            )
+
+    async def start(self):
+        await asyncio.gather(*(instance.start() for instance in self.instances))
+
+    async def run(self, message_handler):
+        results = await asyncio.gather(
+            *(instance.run(message_handler, self.recorder) for instance in self.instances), return_exceptions=True
+        )
+        for instance, result in zip(self.instances, results):
+            if isinstance(result, Exception):
+                print(f"SimpleX CLI instance {instance.index} failed: {str(result)}")
+
+    @property
+    def alive(self) -> bool:
+        return any(instance.alive for instance in self.instances)
 
-    asyncio.create_task(log_output(process.stdout, "CLI"))
-    asyncio.create_task(log_output(process.stderr, "CLI Error"))
+    async def stop(self):
+        await asyncio.gather(*(instance.supervisor.stop() for instance in self.instances if instance.supervisor))
+        if self.recorder:
+            self.recorder.close()
 
-    await asyncio.sleep(1)
-    return process
\ No newline at end of file
+    def status(self) -> str:
+        return "\n".join(instance.status() for instance in self.instances)
@@ -0,0 +1,76 @@
+import asyncio
+from typing import List
+
+class AdminCommands:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def profile(self, sender_name: str, args: List[str], ws):
+        try:
+            if len(args) > 2 or (len(args) == 2 and not args[1].isdigit()):
+                await self.bot.safe_send_message(
+                    sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /profile [seconds]!", ws
+                )
+                return
+            if self.bot.profiler.active:
+                await self.bot.safe_send_message(sender_name, "!1 ⚠️ A profiler capture is already running!", ws)
+                return
+            duration = int(args[1]) if len(args) == 2 else None
+            task = asyncio.create_task(self.bot.profiler.capture(duration))
+            await self.bot.safe_send_message(
+                sender_name,
+                f"!2 Profiler Started!\nCapturing for {min(duration or self.bot.profiler.default_duration, self.bot.profiler.max_duration):.0f} seconds.",
+                ws
+            )
+            path = await task
+            await self.bot.safe_send_message(sender_name, f"!2 Profiler Finished!\nReport: `{path}`", ws)
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /profile: {str(e)}!", ws
+            )
+
+    async def instances(self, sender_name: str, args: List[str], ws):
+        pool = self.bot.cli_pool
+        if not pool:
+            await self.bot.safe_send_message(sender_name, "!2 SimpleX CLI Instances!\nNo CLI pool attached.", ws)
+            return
+        await self.bot.safe_send_message(sender_name, "!2 SimpleX CLI Instances!\n" + pool.status(), ws)
+
+    async def broadcast(self, sender_name: str, args: List[str], ws):
+        try:
+            if len(args) < 2:
+                await self.bot.safe_send_message(
+                    sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /broadcast <message>!", ws
+                )
+                return
+            job = self.bot.broadcaster.start(" ".join(args[1:]), sender_name)
+            await self.bot.safe_send_message(
+                sender_name,
+                f"!2 Broadcast {job['id']} Started!\n"
+                f"Recipients: {len(job['recipients'])}\n"
+                f"Rate: {self.bot.broadcaster.rate:g} messages/second\n"
+                "Check progress with !2 /broadcast_status!",
+                ws
+            )
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /broadcast: {str(e)}!", ws
+            )
+
+    async def broadcast_status(self, sender_name: str, args: List[str], ws):
+        await self.bot.safe_send_message(sender_name, "!2 Broadcast Status!\n" + self.bot.broadcaster.status(), ws)
+
+    async def broadcast_cancel(self, sender_name: str, args: List[str], ws):
+        if not self.bot.broadcaster.cancel():
+            await self.bot.safe_send_message(sender_name, "!1 ⚠️ No broadcast is running!", ws)
+
+    async def reload(self, sender_name: str, args: List[str], ws):
+        try:
+            modules = self.bot.reloader.reload()
+            await self.bot.safe_send_message(
+                sender_name, f"!2 Commands Reloaded!\n{len(modules)} module(s): {', '.join(modules)}", ws
+            )
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Reload Failed, Previous Handlers Kept!\n{type(e).__name__}: {str(e)}", ws
+            )
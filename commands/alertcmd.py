@@ -0,0 +1,65 @@
+from typing import List
+
+class AlertCommands:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def alert(self, sender_name: str, args: List[str], ws):
+        try:
+            if len(args) != 5 or args[3].lower() not in ("above", "below"):
+                await self.bot.safe_send_message(
+                    sender_name,
+                    "!1 ⚠️ Invalid Format!\nUse: !2 /alert <from> <to> above|below <rate>!\nExample: /alert BTC XMR above 150",
+                    ws
+                )
+                return
+
+            from_currency = args[1].upper()
+            to_currency = args[2].upper()
+            try:
+                threshold = float(args[4])
+            except ValueError:
+                await self.bot.safe_send_message(sender_name, "!1 ⚠️ Invalid Rate!\nThe rate must be a number.", ws)
+                return
+
+            rates = self.bot.info_refresher.data.get("rates")
+            if rates is not None and f"{from_currency}_{to_currency}" not in rates:
+                await self.bot.safe_send_message(
+                    sender_name, f"!1 ⚠️ Pair {from_currency} to {to_currency} not supported!", ws
+                )
+                return
+
+            alert = self.bot.rate_alerts.add(sender_name, from_currency, to_currency, args[3].lower(), threshold)
+            await self.bot.safe_send_message(
+                sender_name,
+                f"!2 Alert #{alert['id']} Created!\n"
+                f"You will be notified when 1 {from_currency} {alert['direction']} {threshold:.8f} {to_currency}.\n"
+                f"Cancel with !2 /unalert {alert['id']}!",
+                ws
+            )
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /alert: {str(e)}!", ws
+            )
+
+    async def alerts(self, sender_name: str, args: List[str], ws):
+        alerts = self.bot.rate_alerts.for_user(sender_name)
+        if not alerts:
+            await self.bot.safe_send_message(
+                sender_name, "!2 Your Alerts!\nNo active alerts. Create one with !2 /alert <from> <to> above|below <rate>!", ws
+            )
+            return
+        lines = [
+            f"#{alert['id']}: {alert['pair'].replace('_', ' → ')} {alert['direction']} {alert['threshold']:.8f}"
+            for alert in alerts
+        ]
+        await self.bot.safe_send_message(sender_name, "!2 Your Alerts!\n" + "\n".join(lines), ws)
+
+    async def unalert(self, sender_name: str, args: List[str], ws):
+        if len(args) != 2 or not args[1].isdigit():
+            await self.bot.safe_send_message(sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /unalert <alert_id>!", ws)
+            return
+        if self.bot.rate_alerts.remove(sender_name, int(args[1])):
+            await self.bot.safe_send_message(sender_name, f"!2 Alert #{args[1]} Cancelled!", ws)
+        else:
+            await self.bot.safe_send_message(sender_name, f"!1 ⚠️ Alert #{args[1]} not found!", ws)
@@ -1,6 +1,5 @@
-import asyncio
 from typing import List
-from api.api import create_exchange, get_order_status, validate_address, get_pair_info
+from api.api import create_exchange, validate_address, get_pair_info
 
 class ExchangeCommands:
     def __init__(self, bot):
@@ -49,8 +48,8 @@ class ExchangeCommands:
                     ws
                 )
 
-            flat_info = get_pair_info(from_currency, to_currency, "flat")
-            dynamic_info = get_pair_info(from_currency, to_currency, "dynamic")
+            flat_info = await get_pair_info(from_currency, to_currency, "flat")
+            dynamic_info = await get_pair_info(from_currency, to_currency, "dynamic")
 
             mode_message = (
                 "!2 Select Exchange Mode!\n"
@@ -77,6 +76,8 @@ class ExchangeCommands:
             )
 
     async def handle_mode_selection(self, sender_name: str, mode: str, ws):
+        order_id = None
+        claimed = False
         try:
             if sender_name not in self.bot.exchange_pending:
                 await self.bot.safe_send_message(
@@ -97,8 +98,9 @@ class ExchangeCommands:
                 )
                 return
 
+            del self.bot.exchange_pending[sender_name]
             fee_option = "f" if mode == "flat" else "d"
-            result = create_exchange(
+            result = await create_exchange(
                 from_currency, to_currency, to_address, 0.001,
                 {"refund_address": "", "rate_mode": mode, "fee_option": fee_option}
             )
@@ -108,16 +110,14 @@ class ExchangeCommands:
                 await self.bot.safe_send_message(
                     sender_name, f"!1 ⚠️ Order {order_id} is already being processed!", ws
                 )
-                del self.bot.exchange_pending[sender_name]
                 return
             self.bot.active_exchanges.add(order_id)
+            claimed = True
+            self.bot.awaiting_address[order_id] = sender_name
+            self.bot.order_index.add(sender_name, order_id, from_currency, to_currency, mode)
+            self.bot.transaction_tracker.add_order(sender_name, order_id)
 
-            order_info = get_order_status(order_id)
-            attempts, max_attempts, delay = 0, 5, 3
-            while (not order_info.get("from_addr") or not order_info.get("min_input") or not order_info.get("max_input")) and attempts < max_attempts:
-                await asyncio.sleep(delay)
-                order_info = get_order_status(order_id)
-                attempts += 1
+            order_info = await self.bot.order_waiter.wait_until_ready(order_id)
 
             min_input = order_info.get("min_input", "Not available yet")
             max_input = order_info.get("max_input", "Not available yet")
@@ -136,17 +136,12 @@ class ExchangeCommands:
                 f"Max: {max_input} {from_currency}\n"
                 f"Recipient Address: `{to_address}`\n"
                 f"Link: https://exch.cx/order/{order_id}\n"
-                f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{order_id}\n"
-                "_Deposit address will be generated in 5-15 seconds._"
+                f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{order_id}"
             )
 
             await self.bot.safe_send_message(sender_name, exchange_message, ws)
-            await asyncio.sleep(15)
-            await self.bot.send_deposit_address(sender_name, order_id, ws)
-
-            self.bot.transaction_tracker.add_order(sender_name, order_id)
-            self.bot.active_exchanges.remove(order_id)
-            del self.bot.exchange_pending[sender_name]
+            await self.bot.send_deposit_address(sender_name, order_id, ws, order_info)
+            self.bot.awaiting_address.pop(order_id, None)
         except Exception as e:
             if "TO_ADDRESS_INVALID" in str(e):
                 await self.bot.safe_send_message(
@@ -154,8 +149,19 @@ class ExchangeCommands:
                     "!1 ⚠️ Invalid Address!\nUse !2 /revalidate_address <order_id> <new_address>! to update.",
                     ws
                 )
+            elif claimed:
+                self.bot.awaiting_address.pop(order_id, None)
+                await self.bot.safe_send_message(
+                    sender_name,
+                    f"!1 ⚠️ Order Created, but Loading Its Details Failed: {str(e)}!\n"
+                    f"Order ID: `{order_id}`\nCheck status with !2 /order {order_id}! or contact support@exch.cx",
+                    ws
+                )
             else:
                 await self.bot.safe_send_message(
                     sender_name, f"!1 ⚠️ Error in Mode Selection: {str(e)}!\nContact support@exch.cx", ws
                 )
-            del self.bot.exchange_pending[sender_name]
\ No newline at end of file
+            self.bot.exchange_pending.pop(sender_name, None)
+        finally:
+            if claimed:
+                self.bot.active_exchanges.discard(order_id)
\ No newline at end of file
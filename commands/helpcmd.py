@@ -1,5 +1,3 @@
-from websocket.websock import send_message
-
 class HelpCommand:
     def __init__(self, bot):
         self.bot = bot
@@ -12,9 +10,14 @@ class HelpCommand:
             "- !2 /reserves! - _Check currency reserves_\n"
             "- !2 /volume! - _See 24-hour trading volume_\n"
             "- !2 /status! - _Check network status_\n"
+            "- !2 /quote <from> <to> <amount> [amount...]! - _Estimate what you would receive_\n"
+            "- !2 /alert <from> <to> above|below <rate>! - _Get notified when a rate crosses a threshold_\n"
+            "- !2 /alerts! - _List your alerts_ | !2 /unalert <alert_id>! - _Cancel an alert_\n"
+            "- !2 /history <from> <to> [window]! - _Rate min/max/avg over a window (e.g. 6h, 7d)_\n"
             "- !2 /exchange <from> <to> <address>! - _Start an exchange_\n\n"
             "Order Management\n"
             "- !2 /order <order_id>! - _Check order status_\n"
+            "- !2 /orders! - _Check all your open orders at once_\n"
             "- !2 /fetch_guarantee <order_id>! - _Download Letter of Guarantee_\n"
             "- !2 /revalidate_address <order_id> <to_address>! - _Update recipient address_\n"
             "- !2 /remove_order <order_id>! - _Delete a completed order_\n"
@@ -28,4 +31,4 @@ class HelpCommand:
             "- Always verify addresses before sending.\n"
             "- For assistance, email support@exch.cx"
         )
-        await send_message(sender, help_message, ws)
\ No newline at end of file
+        await self.bot.safe_send_message(sender, help_message, ws)
\ No newline at end of file
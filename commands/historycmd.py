@@ -0,0 +1,51 @@
+import time
+from typing import List
+from main.ratehistory import parse_window
+
+class HistoryCommands:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def history(self, sender_name: str, args: List[str], ws):
+        try:
+            if len(args) not in (3, 4):
+                await self.bot.safe_send_message(
+                    sender_name,
+                    "!1 ⚠️ Invalid Format!\nUse: !2 /history <from> <to> [window]!\nExample: /history BTC XMR 6h (window: 30m, 6h, 7d; default 24h)",
+                    ws
+                )
+                return
+
+            from_currency = args[1].upper()
+            to_currency = args[2].upper()
+            window = args[3] if len(args) == 4 else "24h"
+            try:
+                seconds = parse_window(window)
+            except ValueError as e:
+                await self.bot.safe_send_message(sender_name, f"!1 ⚠️ Invalid Window!\n{str(e)}", ws)
+                return
+
+            now = time.time()
+            stats = self.bot.rate_history.query(f"{from_currency}_{to_currency}", now - seconds)
+            if not stats:
+                await self.bot.safe_send_message(
+                    sender_name, f"!1 ⚠️ No History!\nNo recorded rates for {from_currency} → {to_currency} in the last {window}.", ws
+                )
+                return
+
+            change = (stats["last"] - stats["first"]) / stats["first"] * 100 if stats["first"] else 0.0
+            await self.bot.safe_send_message(
+                sender_name,
+                "!2 Rate History!\n"
+                f"Pair: {from_currency} → {to_currency} (last {window}, {stats['count']} points)\n"
+                f"Min: {stats['min']:.8f}\n"
+                f"Max: {stats['max']:.8f}\n"
+                f"Avg: {stats['avg']:.8f}\n"
+                f"Last: {stats['last']:.8f} ({int(now - stats['last_time'])}s ago)\n"
+                f"Change: {change:+.2f}%",
+                ws
+            )
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /history: {str(e)}!\nContact support@exch.cx", ws
+            )
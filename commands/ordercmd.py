@@ -1,9 +1,17 @@
-from typing import List
-from api.api import get_order_status, fetch_guarantee, revalidate_address, remove_order, format_order_status
+import asyncio
+from typing import Dict, List
+from api.api import get_order_status, revalidate_address, remove_order, format_order_status, validate_order_id
+from websocket.websock import text_content, file_content
+from config.settings import ORDERS_LOOKUP_CONCURRENCY
 
 class OrderCommands:
     def __init__(self, bot):
         self.bot = bot
+        self.lookup_limit = asyncio.Semaphore(ORDERS_LOOKUP_CONCURRENCY)
+
+    async def lookup(self, order_id: str) -> Dict:
+        async with self.lookup_limit:
+            return await get_order_status(order_id)
 
     async def order(self, sender_name: str, args: List[str], ws):
         try:
@@ -12,7 +20,7 @@ class OrderCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /order <order_id>!", ws
                 )
                 return
-            order_info = get_order_status(args[1])
+            order_info = await get_order_status(args[1])
             await self.bot.safe_send_message(
                 sender_name,
                 f"!2 Order Status!\nOrder ID: `{args[1]}`\n" + format_order_status(order_info),
@@ -23,6 +31,38 @@ class OrderCommands:
                 sender_name, f"!1 ⚠️ Error in /order: {str(e)}!\nContact support@exch.cx", ws
             )
 
+    async def orders(self, sender_name: str, args: List[str], ws):
+        try:
+            index = self.bot.order_index
+            order_ids = index.open_orders(sender_name)
+            if not order_ids:
+                await self.bot.safe_send_message(
+                    sender_name,
+                    "!2 Your Orders!\nNo open orders.\nOrders created with !2 /exchange! are listed here.",
+                    ws
+                )
+                return
+            results = await asyncio.gather(*(self.lookup(order_id) for order_id in order_ids), return_exceptions=True)
+            lines = ["!2 Your Orders!"]
+            for order_id, result in zip(order_ids, results):
+                entry = index.entry(sender_name, order_id)
+                pair = f"{entry.get('from_currency', '?')}→{entry.get('to_currency', '?')}"
+                if isinstance(result, Exception):
+                    lines.append(f"`{order_id}` {pair} | ⚠️ {str(result)}")
+                    continue
+                index.mark_state(sender_name, order_id, result["state"])
+                received = result.get("from_amount_received")
+                amount = f" | received {received} {result.get('from_currency', '')}" if received else ""
+                lines.append(f"`{order_id}` {pair} {entry.get('mode', '')} | {result['state']}{amount}")
+            finished = len(index.for_user(sender_name)) - len(index.open_orders(sender_name))
+            if finished:
+                lines.append(f"\n{finished} finished order(s) hidden.")
+            await self.bot.safe_send_message(sender_name, "\n".join(lines), ws)
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /orders: {str(e)}!\nContact support@exch.cx", ws
+            )
+
     async def fetch_guarantee(self, sender_name: str, args: List[str], ws):
         try:
             if len(args) != 2:
@@ -30,12 +70,20 @@ class OrderCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /fetch_guarantee <order_id>!", ws
                 )
                 return
-            fetch_guarantee(args[1])
-            await self.bot.safe_send_message(
+            if not validate_order_id(args[1]):
+                await self.bot.safe_send_message(sender_name, "!1 ⚠️ Invalid Order ID!", ws)
+                return
+            path = await self.bot.guarantee_cache.get(args[1])
+            await self.bot.safe_send_contents(
                 sender_name,
-                f"!2 Letter of Guarantee for Order {args[1]}!\n"
-                f"Link: https://exch.cx/order/{args[1]}/fetch_guarantee\n"
-                f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{args[1]}/fetch_guarantee",
+                [
+                    text_content(
+                        f"!2 Letter of Guarantee for Order {args[1]}!\n"
+                        f"Link: https://exch.cx/order/{args[1]}/fetch_guarantee\n"
+                        f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{args[1]}/fetch_guarantee"
+                    ),
+                    file_content(path)
+                ],
                 ws
             )
         except Exception as e:
@@ -50,9 +98,9 @@ class OrderCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /revalidate_address <order_id> <to_address>!", ws
                 )
                 return
-            result = revalidate_address(args[1], args[2])
+            result = await revalidate_address(args[1], args[2])
             if result.get("result"):
-                order_info = get_order_status(args[1])
+                order_info = await get_order_status(args[1])
                 await self.bot.safe_send_message(
                     sender_name,
                     f"!2 Address Updated for Order {args[1]}!\n\nUpdated Order Status:\n" + format_order_status(order_info),
@@ -72,7 +120,9 @@ class OrderCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /remove_order <order_id>!", ws
                 )
                 return
-            result = remove_order(args[1])
+            result = await remove_order(args[1])
+            if result.get("result"):
+                self.bot.order_index.remove(sender_name, args[1])
             await self.bot.safe_send_message(
                 sender_name,
                 f"!2 Order {args[1]} Removed Successfully!" if result.get("result") else f"!1 ⚠️ Error: {result.get('error')}!",
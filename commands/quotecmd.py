@@ -0,0 +1,36 @@
+from typing import List
+from api.quote import quote, format_quote
+
+MAX_AMOUNTS = 10
+
+class QuoteCommands:
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def quote(self, sender_name: str, args: List[str], ws):
+        try:
+            if len(args) < 4 or len(args) > 3 + MAX_AMOUNTS:
+                await self.bot.safe_send_message(
+                    sender_name,
+                    f"!1 ⚠️ Invalid Format!\nUse: !2 /quote <from> <to> <amount> [amount...]!\nExample: /quote BTC XMR 0.01 0.1 (up to {MAX_AMOUNTS} amounts)",
+                    ws
+                )
+                return
+
+            from_currency = args[1].upper()
+            to_currency = args[2].upper()
+            try:
+                amounts = [float(amount) for amount in args[3:]]
+            except ValueError:
+                await self.bot.safe_send_message(sender_name, "!1 ⚠️ Invalid Amount!\nAmounts must be numbers.", ws)
+                return
+            if any(amount <= 0 for amount in amounts):
+                await self.bot.safe_send_message(sender_name, "!1 ⚠️ Invalid Amount!\nAmounts must be positive.", ws)
+                return
+
+            quotes = await quote(from_currency, to_currency, amounts)
+            await self.bot.safe_send_message(sender_name, format_quote(from_currency, to_currency, quotes), ws)
+        except Exception as e:
+            await self.bot.safe_send_message(
+                sender_name, f"!1 ⚠️ Error in /quote: {str(e)}!\nContact support@exch.cx", ws
+            )
@@ -12,7 +12,7 @@ class RefundCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /refund <order_id>!", ws
                 )
                 return
-            refund_result = request_refund(args[1])
+            refund_result = await request_refund(args[1])
             await self.bot.safe_send_message(
                 sender_name,
                 f"!2 Refund Requested for Order {args[1]}!\nCheck status with !2 /order {args[1]}!" if refund_result.get("result") else f"!1 ⚠️ Error: {refund_result.get('error')}!",
@@ -30,7 +30,7 @@ class RefundCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /refund_confirm <order_id> <refund_address>!", ws
                 )
                 return
-            confirm_result = confirm_refund(args[1], args[2])
+            confirm_result = await confirm_refund(args[1], args[2])
             await self.bot.safe_send_message(
                 sender_name,
                 f"!2 Refund Confirmed for Order {args[1]}!\nCheck status with !2 /order {args[1]}!" if confirm_result.get("result") else f"!1 ⚠️ Error: {confirm_result.get('error')}!",
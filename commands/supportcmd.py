@@ -1,5 +1,5 @@
 from typing import List
-from api.api import send_support_message, get_support_messages, format_support_messages
+from api.api import send_support_message
 
 class SupportCommands:
     def __init__(self, bot):
@@ -12,10 +12,14 @@ class SupportCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /support_message <order_id> <message>!", ws
                 )
                 return
-            result = send_support_message(args[1], " ".join(args[2:]))
+            message = " ".join(args[2:])
+            await self.bot.support_watcher.before_send(sender_name, args[1])
+            result = await send_support_message(args[1], message)
+            if result.get("result"):
+                await self.bot.support_watcher.message_sent(sender_name, args[1], message)
             await self.bot.safe_send_message(
                 sender_name,
-                f"!2 Support Message Sent for Order {args[1]}!\nCheck replies with !2 /support_messages {args[1]}!" if result.get("result") else f"!1 ⚠️ Error: {result.get('error')}!",
+                f"!2 Support Message Sent for Order {args[1]}!\nReplies will be forwarded here. View the chat with !2 /support_messages {args[1]}!" if result.get("result") else f"!1 ⚠️ Error: {result.get('error')}!",
                 ws
             )
         except Exception as e:
@@ -30,10 +34,10 @@ class SupportCommands:
                     sender_name, "!1 ⚠️ Invalid Format!\nUse: !2 /support_messages <order_id>!", ws
                 )
                 return
-            messages = get_support_messages(args[1])
+            history = await self.bot.support_watcher.history(sender_name, args[1])
             await self.bot.safe_send_message(
                 sender_name,
-                f"!2 Support Chat!\nOrder ID: `{args[1]}`\n" + format_support_messages(messages),
+                f"!2 Support Chat!\nOrder ID: `{args[1]}`\n" + history,
                 ws
             )
         except Exception as e:
@@ -0,0 +1,65 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def _int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+def _float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+SIMPLEX_PATH = os.getenv("SIMPLEX_PATH")
+SIMPLEX_DB = os.getenv("SIMPLEX_DB")
+PORT = _int("PORT", 8000)
+SIMPLEX_INSTANCES = _int("SIMPLEX_INSTANCES", 1)
+BOT_WORKERS = _int("BOT_WORKERS", 1)
+
+if BOT_WORKERS > 1 and SIMPLEX_INSTANCES > 1:
+    raise ValueError(
+        "BOT_WORKERS > 1 cannot be combined with SIMPLEX_INSTANCES > 1: "
+        "the shard router only connects to the first SimpleX CLI instance"
+    )
+
+API_BASE_URL = os.getenv("API_BASE_URL")
+API_KEY = os.getenv("API_KEY")
+AFFILIATE_ID = os.getenv("AFFILIATE_ID")
+
+API_MAX_ATTEMPTS = _int("API_MAX_ATTEMPTS", 3)
+API_RETRY_BASE_DELAY = _float("API_RETRY_BASE_DELAY", 0.5)
+API_RETRY_MAX_DELAY = _float("API_RETRY_MAX_DELAY", 8)
+API_RETRY_BUDGET_RATIO = _float("API_RETRY_BUDGET_RATIO", 0.2)
+API_MAX_RPS = _float("API_MAX_RPS", 5)
+API_BURST = _int("API_BURST", 5)
+RATES_CACHE_TTL = _float("RATES_CACHE_TTL", 15)
+RATES_SNAPSHOT_DIR = os.getenv("RATES_SNAPSHOT_DIR", "rates_snapshot")
+ORDER_CACHE_TTL = _float("ORDER_CACHE_TTL", 5)
+INFO_REFRESH_INTERVAL = _float("INFO_REFRESH_INTERVAL", 30)
+SUPPORT_POLL_INTERVAL = _float("SUPPORT_POLL_INTERVAL", 30)
+
+MAX_IN_FLIGHT_COMMANDS = _int("MAX_IN_FLIGHT_COMMANDS", 20)
+MAX_QUEUED_COMMANDS = _int("MAX_QUEUED_COMMANDS", 20)
+COMMAND_QUEUE_TIMEOUT = _float("COMMAND_QUEUE_TIMEOUT", 2)
+LOOP_STALL_THRESHOLD = _float("LOOP_STALL_THRESHOLD", 1)
+ORDER_READY_TIMEOUT = _float("ORDER_READY_TIMEOUT", 45)
+
+ADMIN_CONTACT_IDS = {
+    entry if ":" in entry else f"0:{entry}"
+    for entry in (part.strip() for part in os.getenv("ADMIN_CONTACT_IDS", "").split(","))
+    if all(piece.isdigit() for piece in entry.split(":", 1))
+}
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+RATE_HISTORY_DIR = os.getenv("RATE_HISTORY_DIR", "rate_history")
+RATE_HISTORY_RETENTION_DAYS = _float("RATE_HISTORY_RETENTION_DAYS", 30)
+ORDERS_LOOKUP_CONCURRENCY = _int("ORDERS_LOOKUP_CONCURRENCY", 5)
+NOTIFY_COALESCE_WINDOW = _float("NOTIFY_COALESCE_WINDOW", 1.0)
+MAX_MESSAGE_CHARS = _int("MAX_MESSAGE_CHARS", 4000)
+BROADCAST_STATE_FILE = os.getenv("BROADCAST_STATE_FILE", "broadcast.json")
+BROADCAST_RATE = _float("BROADCAST_RATE", 2)
+BROADCAST_BATCH_SIZE = _int("BROADCAST_BATCH_SIZE", 10)
+BOT_STATE_FILE = os.getenv("BOT_STATE_FILE", "bot_state.json")
+SHUTDOWN_DRAIN_TIMEOUT = max(_float("SHUTDOWN_DRAIN_TIMEOUT", 60), ORDER_READY_TIMEOUT)
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", "")
+EVENT_LOG_ANONYMIZE_KEY = os.getenv("EVENT_LOG_ANONYMIZE_KEY", "")
+GUARANTEE_DIR = os.getenv("GUARANTEE_DIR", "guarantees")
+GUARANTEE_CACHE_MAX_MB = _float("GUARANTEE_CACHE_MAX_MB", 50)
@@ -1,27 +1,71 @@
+import time
+STARTED = time.perf_counter()
+
 import sys
-import os
 import asyncio
-from dotenv import load_dotenv
-from client.cli import start_client
-from websocket.websock import connect_websocket
-from main.bot import Bot
+from main.startup import StartupTimer
+
+TIMER = StartupTimer(STARTED)
+
+with TIMER.phase("config and imports"):
+    from config.settings import PORT, SIMPLEX_INSTANCES, BOT_WORKERS, BOT_STATE_FILE, SHUTDOWN_DRAIN_TIMEOUT
+    from api.api import rates_cache
+    from client.cli import CliPool
+    from main.bot import Bot
+    from main.shard import ShardRouter, run_worker
+    from main.shutdown import ShutdownCoordinator
 
 sys.path.append("path to project")
 print("Python path:", sys.path)
 
-load_dotenv()
-
 async def start_bot():
     print("Starting..")
     try:
-        await start_client(int(os.getenv("PORT")))
-        print("SimpleX CLI started")
+        pool = CliPool(SIMPLEX_INSTANCES, PORT)
+        await asyncio.gather(
+            TIMER.track("simplex cli", pool.start()),
+            TIMER.track("rates warm-up", rates_cache.warm("dynamic", "flat"))
+        )
+        print(f"{len(pool.instances)} SimpleX CLI instance(s) started")
+
+        if BOT_WORKERS > 1:
+            TIMER.report("shard router starting")
+            router = ShardRouter(pool.instances[0].port, BOT_WORKERS, shutdown_timeout=SHUTDOWN_DRAIN_TIMEOUT + 10)
+            router.install_signal_handlers()
+            await router.run()
+            await pool.stop()
+            print("Shutdown complete")
+            return
+
+        with TIMER.phase("bot init"):
+            bot = Bot(None)
+            bot.cli_pool = pool
+            coordinator = ShutdownCoordinator(bot, BOT_STATE_FILE, SHUTDOWN_DRAIN_TIMEOUT)
+            coordinator.restore()
+            coordinator.install_signal_handlers()
+            bot.broadcaster.resume()
+
+        connect_began = time.perf_counter()
+
+        async def handle_message(response, ws):
+            if not TIMER.reported:
+                TIMER.record("websocket connect", connect_began)
+                TIMER.report("first event")
+            await bot.handle_message(response, ws)
 
-        bot = Bot(None)
-        await connect_websocket(int(os.getenv("PORT")), bot.handle_message)
+        runner = asyncio.create_task(pool.run(handle_message))
+        stopped = asyncio.create_task(coordinator.stopped.wait())
+        await asyncio.wait({runner, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        runner.cancel()
+        stopped.cancel()
+        await pool.stop()
+        print("Shutdown complete")
     except Exception as e:
         print(f"Failed to start SimpleX CLI: {str(e)}")
         exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(start_bot())
+    if len(sys.argv) == 4 and sys.argv[1] == "--worker":
+        asyncio.run(run_worker(int(sys.argv[2]), int(sys.argv[3])))
+    else:
+        asyncio.run(start_bot())
@@ -0,0 +1,94 @@
+import bisect
+from typing import Dict, List, Tuple
+
+class RateAlerts:
+    def __init__(self, bot, max_per_user: int = 10):
+        self.bot = bot
+        self.max_per_user = max_per_user
+        self.books: Dict[str, Dict[str, Tuple[List[float], List[Dict]]]] = {}
+        self.user_alerts: Dict[str, Dict[int, Dict]] = {}
+        self.next_id = 1
+
+    def add(self, user: str, from_currency: str, to_currency: str, direction: str, threshold: float) -> Dict:
+        if direction not in ("above", "below"):
+            raise ValueError("Direction must be 'above' or 'below'")
+        if len(self.user_alerts.get(user, {})) >= self.max_per_user:
+            raise ValueError(f"You can have at most {self.max_per_user} active alerts")
+        alert = {
+            "id": self.next_id,
+            "user": user,
+            "pair": f"{from_currency}_{to_currency}",
+            "direction": direction,
+            "threshold": threshold
+        }
+        self.next_id += 1
+        self.insert(alert)
+        return alert
+
+    def insert(self, alert: Dict):
+        direction = alert["direction"]
+        threshold = alert["threshold"]
+        book = self.books.setdefault(alert["pair"], {"above": ([], []), "below": ([], [])})
+        thresholds, alerts = book[direction]
+        index = bisect.bisect_right(thresholds, threshold)
+        thresholds.insert(index, threshold)
+        alerts.insert(index, alert)
+        self.user_alerts.setdefault(alert["user"], {})[alert["id"]] = alert
+
+    def snapshot(self) -> Dict:
+        return {
+            "next_id": self.next_id,
+            "alerts": [alert for alerts in self.user_alerts.values() for alert in alerts.values()]
+        }
+
+    def restore(self, state: Dict):
+        for alert in state.get("alerts", []):
+            self.insert(alert)
+        self.next_id = max(self.next_id, state.get("next_id", 1))
+
+    def remove(self, user: str, alert_id: int) -> bool:
+        alert = self.user_alerts.get(user, {}).pop(alert_id, None)
+        if not alert:
+            return False
+        thresholds, alerts = self.books[alert["pair"]][alert["direction"]]
+        index = bisect.bisect_left(thresholds, alert["threshold"])
+        while alerts[index] is not alert:
+            index += 1
+        del thresholds[index]
+        del alerts[index]
+        return True
+
+    def for_user(self, user: str) -> List[Dict]:
+        return sorted(self.user_alerts.get(user, {}).values(), key=lambda alert: alert["id"])
+
+    def triggered(self, rates: Dict) -> List[Tuple[Dict, float]]:
+        fired = []
+        for pair, book in self.books.items():
+            if pair not in rates:
+                continue
+            rate = float(rates[pair]["rate"])
+            thresholds, alerts = book["above"]
+            index = bisect.bisect_right(thresholds, rate)
+            if index:
+                fired.extend((alert, rate) for alert in alerts[:index])
+                del thresholds[:index]
+                del alerts[:index]
+            thresholds, alerts = book["below"]
+            index = bisect.bisect_left(thresholds, rate)
+            if index < len(thresholds):
+                fired.extend((alert, rate) for alert in alerts[index:])
+                del thresholds[index:]
+                del alerts[index:]
+        for alert, _ in fired:
+            self.user_alerts.get(alert["user"], {}).pop(alert["id"], None)
+        return fired
+
+    async def on_rates(self, rates: Dict):
+        for alert, rate in self.triggered(rates):
+            from_currency, to_currency = alert["pair"].split("_")
+            self.bot.notify(
+                alert["user"],
+                f"!2 🔔 Rate Alert #{alert['id']}!\n"
+                f"1 {from_currency} = {rate:.8f} {to_currency} is now {alert['direction']} {alert['threshold']:.8f}.\n"
+                f"Get a quote with !2 /quote {from_currency} {to_currency} <amount>!"
+            )
@@ -2,43 +2,143 @@ import asyncio
 import json
 import os
 import re
-from typing import Dict, List, Set
+import time
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
-import qrcode
-from api.api import get_rates, extract_currencies, get_order_status
-from websocket.websock import send_message, send_image
+from api.api import rates_cache, extract_currencies, get_order_status
+from api.scheduler import use_background_priority
+from websocket.websock import send_contents, text_content, file_content
 from main.txtrack import TransactionTracker
+from main.orderwait import OrderWaiter, address_ready
+from main.inforefresh import InfoRefresher
+from main.alerts import RateAlerts
+from main.ratehistory import RateHistory
+from main.supportwatch import SupportWatcher
+from main.guarantee import GuaranteeCache
+from main.orderindex import OrderIndex
+from main.shaper import MessageShaper
+from main.broadcast import Broadcaster
+from main.watchdog import LoopWatchdog
+from main.profiler import Profiler
 from protection.antispam import AntiSpam
-from commands.helpcmd import HelpCommand
-from commands.infocmd import InfoCommands
-from commands.exchangecmd import ExchangeCommands
-from commands.ordercmd import OrderCommands
-from commands.refundcmd import RefundCommands
-from commands.supportcmd import SupportCommands
+from protection.admission import AdmissionController
+from main.reloader import CommandReloader
+from commands import (
+    helpcmd, infocmd, exchangecmd, ordercmd, refundcmd, supportcmd, admincmd, quotecmd, alertcmd, historycmd
+)
+from config.settings import (
+    ADMIN_CONTACT_IDS, MAX_IN_FLIGHT_COMMANDS, MAX_QUEUED_COMMANDS, COMMAND_QUEUE_TIMEOUT,
+    LOOP_STALL_THRESHOLD, PROFILE_DIR, ORDER_READY_TIMEOUT, INFO_REFRESH_INTERVAL,
+    RATE_HISTORY_DIR, RATE_HISTORY_RETENTION_DAYS, SUPPORT_POLL_INTERVAL, GUARANTEE_DIR, GUARANTEE_CACHE_MAX_MB,
+    NOTIFY_COALESCE_WINDOW, MAX_MESSAGE_CHARS, BROADCAST_STATE_FILE, BROADCAST_RATE, BROADCAST_BATCH_SIZE
+)
+
+CHEAP_COMMANDS = {"/help", "/quote", "/alert", "/alerts", "/unalert", "/history"}
+
+def contact_key(instance: int, contact_id: int) -> str:
+    return f"{instance}:{contact_id}"
+
+def instance_index(ws) -> int:
+    return getattr(getattr(ws, "instance", None), "index", 0)
 
 class Bot:
-    def __init__(self, ws):
+    def __init__(self, ws, shard: Optional[int] = None):
         self.ws = ws
+        self.shard = shard
         self.connected_users: Set[str] = set()
         self.available_currencies: List[str] = ["BTC", "BTCLN", "DAI", "DASH", "ETH", "LTC", "USDC", "USDT", "XMR"]
         self.active_exchanges: Set[str] = set()
         self.exchange_pending: Dict[str, Dict] = {}
+        self.awaiting_address: Dict[str, str] = {}
+        self.contacts: Dict[str, Dict] = {}
+        self.cli_pool = None
+        self.admin_ids: Set[str] = ADMIN_CONTACT_IDS
+        self.accepting_commands = True
 
-        self.help_command = HelpCommand(self)
-        self.info_commands = InfoCommands(self)
-        self.exchange_commands = ExchangeCommands(self)
-        self.order_commands = OrderCommands(self)
-        self.refund_commands = RefundCommands(self)
-        self.support_commands = SupportCommands(self)
+        self.handlers: Dict[str, object] = {}
+        self.admin_handlers: Dict[str, object] = {}
+        self.build_commands()
 
+        self.order_index = OrderIndex()
+        self.shaper = MessageShaper(self, NOTIFY_COALESCE_WINDOW, MAX_MESSAGE_CHARS)
         self.transaction_tracker = TransactionTracker(self)
+        self.order_waiter = OrderWaiter(self, ORDER_READY_TIMEOUT)
+        self.support_watcher = SupportWatcher(self, SUPPORT_POLL_INTERVAL)
+        self.guarantee_cache = GuaranteeCache(GUARANTEE_DIR, int(GUARANTEE_CACHE_MAX_MB * 1024 * 1024))
+        self.info_refresher = InfoRefresher(INFO_REFRESH_INTERVAL)
+        self.rate_alerts = RateAlerts(self)
+        self.info_refresher.add_rates_listener(self.rate_alerts.on_rates)
+        self.rate_history = RateHistory(RATE_HISTORY_DIR, retention=RATE_HISTORY_RETENTION_DAYS * 86400)
+        if not shard:
+            self.rate_history.start()
+            self.info_refresher.add_rates_listener(self.rate_history.on_rates)
+        self.info_refresher.start()
         self.anti_spam = AntiSpam(5000)
+        self.admission = AdmissionController(
+            max_in_flight=MAX_IN_FLIGHT_COMMANDS,
+            max_queue=MAX_QUEUED_COMMANDS,
+            queue_timeout=COMMAND_QUEUE_TIMEOUT
+        )
+        self.command_tasks: Set[asyncio.Task] = set()
+        self.broadcaster = Broadcaster(self, BROADCAST_STATE_FILE, BROADCAST_RATE, BROADCAST_BATCH_SIZE)
+
+        self.watchdog = LoopWatchdog(LOOP_STALL_THRESHOLD)
+        self.watchdog.start()
+        self.profiler = Profiler(PROFILE_DIR)
+        self.profiler.install_signal_handler()
+        self.reloader = CommandReloader(self)
+        self.reloader.install_signal_handler()
 
         asyncio.create_task(self.initialize_currencies())
 
+    def build_commands(self):
+        self.help_command = helpcmd.HelpCommand(self)
+        self.info_commands = infocmd.InfoCommands(self)
+        self.exchange_commands = exchangecmd.ExchangeCommands(self)
+        self.order_commands = ordercmd.OrderCommands(self)
+        self.refund_commands = refundcmd.RefundCommands(self)
+        self.support_commands = supportcmd.SupportCommands(self)
+        self.admin_commands = admincmd.AdminCommands(self)
+        self.quote_commands = quotecmd.QuoteCommands(self)
+        self.alert_commands = alertcmd.AlertCommands(self)
+        self.history_commands = historycmd.HistoryCommands(self)
+
+        self.handlers = {
+            "/help": self.help_command.execute,
+            "/rates": self.info_commands.rates,
+            "/reserves": self.info_commands.reserves,
+            "/volume": self.info_commands.volume,
+            "/status": self.info_commands.status,
+            "/quote": self.quote_commands.quote,
+            "/alert": self.alert_commands.alert,
+            "/alerts": self.alert_commands.alerts,
+            "/unalert": self.alert_commands.unalert,
+            "/history": self.history_commands.history,
+            "/exchange": self.exchange_commands.exchange,
+            "/order": self.order_commands.order,
+            "/orders": self.order_commands.orders,
+            "/fetch_guarantee": self.order_commands.fetch_guarantee,
+            "/revalidate_address": self.order_commands.revalidate_address,
+            "/remove_order": self.order_commands.remove_order,
+            "/refund": self.refund_commands.refund,
+            "/refund_confirm": self.refund_commands.refund_confirm,
+            "/support_message": self.support_commands.support_message,
+            "/support_messages": self.support_commands.support_messages
+        }
+
+        self.admin_handlers = {
+            "/profile": self.admin_commands.profile,
+            "/instances": self.admin_commands.instances,
+            "/broadcast": self.admin_commands.broadcast,
+            "/broadcast_status": self.admin_commands.broadcast_status,
+            "/broadcast_cancel": self.admin_commands.broadcast_cancel,
+            "/reload": self.admin_commands.reload
+        }
+
     async def initialize_currencies(self):
+        use_background_priority()
         try:
-            rates = get_rates("dynamic")
+            rates = await rates_cache.get("dynamic")
             self.available_currencies = extract_currencies(rates) if rates else self.available_currencies
             print("Available currencies:", self.available_currencies)
         except Exception as e:
@@ -81,14 +181,13 @@ class Bot:
 
         if response.get("resp", {}).get("type") == "contactRequest":
             contact = response["resp"]["contact"]
-            contact_name = contact["localDisplayName"]
-            contact_id = contact["contactId"]
-            print(f"New contact request from: {contact_name} (ID: {contact_id})")
-            await self.safe_send_message(contact_name, "accept", ws)
-            print(f"Contact accepted: {contact_name}")
-            if contact_id not in self.connected_users:
-                await self.help_command.execute(contact_name, ["/help"], ws)
-                self.connected_users.add(contact_id)
+            print(f"New contact request from: {contact['localDisplayName']} (ID: {contact['contactId']})")
+            key = self.register_contact(contact, ws)
+            await self.safe_send_message(key, "accept", ws)
+            print(f"Contact accepted: {contact['localDisplayName']}")
+            if key not in self.connected_users:
+                await self.help_command.execute(key, ["/help"], ws)
+                self.connected_users.add(key)
 
         if response.get("resp", {}).get("type") == "newChatItems":
             item = response["resp"]["chatItems"][0] if response["resp"]["chatItems"] else None
@@ -99,83 +198,133 @@ class Bot:
             chat_item = item["chatItem"]
             if chat_item.get("chatDir", {}).get("type") == "directRcv":
                 sender_contact = item["chatInfo"]["contact"]
-                sender_name = sender_contact["localDisplayName"]
-                sender_id = sender_contact["contactId"]
                 item_text = chat_item["meta"].get("itemText", "")
-                print(f"Message from {sender_name} (ID: {sender_id}): {item_text}")
+                sender_name = self.register_contact(sender_contact, ws)
+                print(f"Message from {sender_contact['localDisplayName']} ({sender_name}): {item_text}")
 
-                if sender_id not in self.connected_users:
-                    print(f"New user detected: {sender_name} (ID: {sender_id}), sending /help")
+                if sender_name not in self.connected_users:
+                    print(f"New user detected: {sender_contact['localDisplayName']} ({sender_name}), sending /help")
                     await self.help_command.execute(sender_name, ["/help"], ws)
-                    self.connected_users.add(sender_id)
+                    self.connected_users.add(sender_name)
 
                 if self.is_system_message(item_text):
                     print(f"Ignoring system message/notification from {sender_name}: {item_text}")
                     return
 
-                await self.process_command(sender_name, item_text, ws)
+                if not self.accepting_commands:
+                    await self.safe_send_message(
+                        sender_name, "!1 ⏳ Bot is Restarting!\nPlease retry in a few seconds.", ws
+                    )
+                    return
+
+                task = asyncio.create_task(
+                    self.process_command(sender_name, item_text, ws),
+                    name=f"command {sender_name}: {item_text[:40]}"
+                )
+                self.command_tasks.add(task)
+                task.add_done_callback(self.command_tasks.discard)
+
+    def register_contact(self, contact: Dict, ws) -> str:
+        instance = instance_index(ws)
+        key = contact_key(instance, contact["contactId"])
+        self.contacts[key] = {"instance": instance, "id": contact["contactId"], "name": contact["localDisplayName"]}
+        return key
+
+    def contact_address(self, sender_name: str) -> Optional[Tuple[int, int]]:
+        contact = self.contacts.get(sender_name)
+        if contact:
+            return contact["instance"], contact["id"]
+        instance, _, contact_id = sender_name.partition(":")
+        if instance.isdigit() and contact_id.isdigit():
+            return int(instance), int(contact_id)
+        return None
+
+    async def deliver(self, sender_name: str, contents: List[Dict], ws):
+        address = self.contact_address(sender_name)
+        if not address:
+            raise ValueError(f"Unknown contact {sender_name}")
+        await send_contents(address[1], contents, ws)
+
+    def notify(self, sender_name: str, message: str):
+        self.shaper.enqueue(sender_name, message)
 
     async def safe_send_message(self, sender_name: str, message: str, ws):
+        await self.safe_send_messages(sender_name, [message], ws)
+
+    async def safe_send_messages(self, sender_name: str, messages: List[str], ws):
+        await self.safe_send_contents(
+            sender_name, [text_content(chunk) for message in messages for chunk in self.shaper.split(message)], ws
+        )
+
+    async def safe_send_contents(self, sender_name: str, contents: List[Dict], ws):
         try:
             if not ws or not hasattr(ws, "send"):
                 raise ValueError("WebSocket connection is not available or has been closed")
-            print(f"Sending to {sender_name}: {message}")
-            if " " in sender_name:
-                print(f"Warning: Username '{sender_name}' contains a space, messages may not be delivered due to SimpleX CLI limitation.")
-            await send_message(sender_name, message, ws)
+            for content in contents:
+                print(f"Sending to {sender_name}: {content.get('fileSource', {}).get('filePath') or content['msgContent']['text']}")
+            await self.deliver(sender_name, contents, ws)
         except Exception as e:
             print(f"Failed to send message to {sender_name}: {str(e)}")
             if ws and hasattr(ws, "send"):
-                await send_message(
-                    sender_name,
-                    f"!1 ⚠️ Connection Error: {str(e)}!\nPlease try again or contact support@exch.cx",
-                    ws
-                )
+                try:
+                    await self.deliver(
+                        sender_name,
+                        [text_content(f"!1 ⚠️ Connection Error: {str(e)}!\nPlease try again or contact support@exch.cx")],
+                        ws
+                    )
+                except Exception as fallback_error:
+                    print(f"Failed to send error notice to {sender_name}: {str(fallback_error)}")
 
     async def send_image(self, sender_name: str, file_path: str, ws):
         try:
             if not ws or not hasattr(ws, "send"):
                 raise ValueError("WebSocket connection is not available or has been closed")
             print(f"Sending image to {sender_name}: {file_path}")
-            if " " in sender_name:
-                print(f"Warning: Username '{sender_name}' contains a space, image may not be delivered due to SimpleX CLI limitation.")
-            await send_image(sender_name, file_path, ws)
+            await self.deliver(sender_name, [file_content(file_path)], ws)
         except Exception as e:
             print(f"Failed to send image to {sender_name}: {str(e)}")
             if ws and hasattr(ws, "send"):
-                await send_message(
+                await self.safe_send_message(
                     sender_name, f"!1 ⚠️ Error Sending QR Code: {str(e)}!\nContact support@exch.cx", ws
                 )
 
-    async def send_deposit_address(self, sender_name: str, order_id: str, ws):
-        try:
-            order_info = get_order_status(order_id)
-            if order_info.get("from_addr") and order_info["from_addr"] != "_GENERATING_":
-                await self.safe_send_message(sender_name, f"!2 Deposit Address!\n{order_info['from_addr']}", ws)
-
-                qr_path = os.path.join(os.path.dirname(__file__), f"{order_id}.jpg")
-                qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)
-                qr.add_data(order_info["from_addr"])
-                qr.make(fit=True)
-                img = qr.make_image(fill_color="black", back_color="white")
-                img.save(qr_path)
+    def render_qr(self, data: str, qr_path: str):
+        import qrcode
+        qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H, box_size=10, border=4)
+        qr.add_data(data)
+        qr.make(fit=True)
+        img = qr.make_image(fill_color="black", back_color="white")
+        img.save(qr_path)
 
-                await self.send_image(sender_name, qr_path, ws)
-
-                await asyncio.sleep(60)
-                try:
-                    os.remove(qr_path)
-                    print(f"QR code {qr_path} deleted after 60 seconds")
-                except Exception as e:
-                    print(f"Failed to delete QR code {qr_path}: {str(e)}")
+    async def remove_file_later(self, path: str, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            os.remove(path)
+            print(f"QR code {path} deleted after {delay:.0f} seconds")
+        except Exception as e:
+            print(f"Failed to delete QR code {path}: {str(e)}")
 
-                await self.safe_send_message(
+    async def send_deposit_address(self, sender_name: str, order_id: str, ws, order_info: Optional[Dict] = None):
+        try:
+            if not order_info or not address_ready(order_info):
+                order_info = await get_order_status(order_id)
+                self.transaction_tracker.observe(order_id, order_info)
+            if address_ready(order_info):
+                await self.safe_send_messages(
                     sender_name,
-                    f"!2 Guarantee Letter Downloads!\n"
-                    f"Link: https://exch.cx/order/{order_id}/fetch_guarantee\n"
-                    f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{order_id}/fetch_guarantee",
+                    [
+                        f"!2 Deposit Address!\n{order_info['from_addr']}",
+                        f"!2 Guarantee Letter Downloads!\n"
+                        f"Link: https://exch.cx/order/{order_id}/fetch_guarantee\n"
+                        f"Tor Link: http://hszyoqwrcp7cxlxnqmovp6vjvmnwj33g4wviuxqzq47emieaxjaperyd.onion/order/{order_id}/fetch_guarantee"
+                    ],
                     ws
                 )
+
+                qr_path = os.path.join(os.path.dirname(__file__), f"{order_id}.jpg")
+                await asyncio.to_thread(self.render_qr, order_info["from_addr"], qr_path)
+                await self.send_image(sender_name, qr_path, ws)
+                asyncio.create_task(self.remove_file_later(qr_path, 60))
             else:
                 await self.safe_send_message(
                     sender_name, f"Deposit Address is Generating...\nCheck status with !2 /order {order_id}!", ws
@@ -186,6 +335,68 @@ class Bot:
             )
             print(f"Error in send_deposit_address for {sender_name}: {str(e)}")
 
+    def checkpoint(self) -> Dict:
+        return {
+            "connected_users": sorted(self.connected_users),
+            "contacts": self.contacts,
+            "exchange_pending": self.exchange_pending,
+            "awaiting_address": self.awaiting_address,
+            "tracked_orders": self.transaction_tracker.snapshot(),
+            "order_index": self.order_index.snapshot(),
+            "alerts": self.rate_alerts.snapshot()
+        }
+
+    def restore(self, state: Dict):
+        self.connected_users.update(state.get("connected_users", []))
+        self.contacts.update(state.get("contacts", {}))
+        self.exchange_pending.update(state.get("exchange_pending", {}))
+        self.transaction_tracker.restore(state.get("tracked_orders", {}))
+        self.order_index.restore(state.get("order_index", {}))
+        self.rate_alerts.restore(state.get("alerts", {}))
+        for order_id, sender_name in state.get("awaiting_address", {}).items():
+            self.awaiting_address[order_id] = sender_name
+            asyncio.create_task(self.resume_deposit_address(sender_name, order_id))
+
+    async def resume_deposit_address(self, sender_name: str, order_id: str):
+        while not self.ws_for(sender_name):
+            await asyncio.sleep(1)
+        try:
+            order_info = await self.order_waiter.wait_until_ready(order_id)
+            await self.send_deposit_address(sender_name, order_id, self.ws_for(sender_name), order_info)
+        except Exception as e:
+            print(f"Error resuming deposit address for order {order_id}: {str(e)}")
+        self.awaiting_address.pop(order_id, None)
+
+    def cli_alive(self) -> bool:
+        return self.cli_pool is None or self.cli_pool.alive
+
+    def cli_connected(self) -> bool:
+        if self.cli_pool is None:
+            return self.ws is not None
+        return all(instance.ws for instance in self.cli_pool.instances)
+
+    def ws_for(self, sender_name: str):
+        address = self.contact_address(sender_name)
+        if address and self.cli_pool and address[0] < len(self.cli_pool.instances):
+            return self.cli_pool.instances[address[0]].ws or self.ws
+        return self.ws
+
+    def is_admin(self, sender_name: str) -> bool:
+        return sender_name in self.admin_ids
+
+    async def run_admitted(self, sender_name: str, ws, handler, *args):
+        if not await self.admission.acquire():
+            print(f"Shedding command from {sender_name}: {self.admission.stats()}")
+            self.anti_spam.clear_cooldown(sender_name)
+            await self.safe_send_message(
+                sender_name, "!1 ⏳ Bot is Busy!\nPlease retry in a few seconds.", ws
+            )
+            return
+        try:
+            await handler(*args)
+        finally:
+            self.admission.release()
+
     async def process_command(self, sender_name: str, text: str, ws):
         print(f"Processing command from {sender_name}: {text}")
         spam_check = self.anti_spam.can_execute(sender_name)
@@ -195,7 +406,9 @@ class Bot:
 
         if sender_name in self.exchange_pending:
             mode = text.strip().lower()
-            await self.exchange_commands.handle_mode_selection(sender_name, mode, ws)
+            started = time.perf_counter()
+            await self.run_admitted(sender_name, ws, self.exchange_commands.handle_mode_selection, sender_name, mode, ws)
+            self.profiler.record_command("mode_selection", time.perf_counter() - started)
             return
 
         match = re.match(r"!2\s*/(\w+)\s*(.*)", text)
@@ -209,33 +422,27 @@ class Bot:
                 return
             command, cmd_args = match.groups()
             command = f"/{command.lower()}"
-            args = cmd_args.split() if cmd_args else []
+            args = [command] + (cmd_args.split() if cmd_args else [])
         else:
             command, cmd_args = match.groups()
             command = f"/{command.lower()}"
-            args = cmd_args.split() if cmd_args else []
+            args = [command] + (cmd_args.split() if cmd_args else [])
 
-        commands = {
-            "/help": self.help_command.execute,
-            "/rates": self.info_commands.rates,
-            "/reserves": self.info_commands.reserves,
-            "/volume": self.info_commands.volume,
-            "/status": self.info_commands.status,
-            "/exchange": self.exchange_commands.exchange,
-            "/order": self.order_commands.order,
-            "/fetch_guarantee": self.order_commands.fetch_guarantee,
-            "/revalidate_address": self.order_commands.revalidate_address,
-            "/remove_order": self.order_commands.remove_order,
-            "/refund": self.refund_commands.refund,
-            "/refund_confirm": self.refund_commands.refund_confirm,
-            "/support_message": self.support_commands.support_message,
-            "/support_messages": self.support_commands.support_messages
-        }
+        commands = self.handlers
+        admin_commands = self.admin_handlers
 
         handler = commands.get(command)
-        if handler:
+        if not handler and command in admin_commands and self.is_admin(sender_name):
+            print(f"Executing admin command: {command} with args: {args}")
+            await admin_commands[command](sender_name, args, ws)
+        elif handler:
             print(f"Executing command: {command} with args: {args}")
-            await handler(sender_name, args, ws)
+            started = time.perf_counter()
+            if command in CHEAP_COMMANDS:
+                await handler(sender_name, args, ws)
+            else:
+                await self.run_admitted(sender_name, ws, handler, sender_name, args, ws)
+            self.profiler.record_command(command, time.perf_counter() - started)
         else:
             await self.safe_send_message(
                 sender_name, "!1 ⚠️ Unknown Command!\nUse !2 /help! for a list of commands.", ws
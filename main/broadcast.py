@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from websocket.websock import send_contents, text_content
+
+class Broadcaster:
+    def __init__(self, bot, state_path: str, rate: float = 2.0, batch_size: int = 10):
+        self.bot = bot
+        self.state_path = state_path
+        self.rate = rate
+        self.batch_size = batch_size
+        self.job: Optional[Dict] = None
+        self.task: Optional[asyncio.Task] = None
+        self.pausing = False
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def load(self) -> Optional[Dict]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, job: Dict):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f)
+        os.replace(temp_path, self.state_path)
+
+    def start(self, message: str, started_by: str) -> Dict:
+        if self.bot.shard is not None:
+            raise ValueError("Broadcasts are not available with BOT_WORKERS > 1, each worker only sees its own contacts")
+        if self.running:
+            raise ValueError(f"Broadcast {self.job['id']} is still running")
+        self.job = {
+            "id": int(time.time()),
+            "message": message,
+            "started_by": started_by,
+            "recipients": sorted(self.bot.connected_users),
+            "position": 0,
+            "sent": 0,
+            "failed": 0,
+            "state": "running",
+            "started_at": time.time(),
+            "finished_at": None
+        }
+        self.save(self.job)
+        self.task = asyncio.create_task(self.run())
+        return self.job
+
+    def resume(self):
+        job = self.load()
+        if not job or job["state"] != "running":
+            self.job = job
+            return
+        print(f"Resuming broadcast {job['id']} at {job['position']}/{len(job['recipients'])}")
+        self.job = job
+        self.task = asyncio.create_task(self.run())
+
+    def cancel(self) -> bool:
+        if not self.running:
+            return False
+        self.job["state"] = "cancelled"
+        self.task.cancel()
+        return True
+
+    async def pause(self):
+        if not self.running:
+            return
+        self.pausing = True
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+    async def run(self):
+        job = self.job
+        try:
+            while not self.bot.cli_connected():
+                await asyncio.sleep(1)
+            while job["position"] < len(job["recipients"]) and job["state"] == "running":
+                while self.bot.admission.stats()["queued"]:
+                    await asyncio.sleep(0.5)
+                batch: List[str] = job["recipients"][job["position"]:job["position"] + self.batch_size]
+                started = time.monotonic()
+                for key in batch:
+                    try:
+                        await self.send(key, job["message"])
+                        job["sent"] += 1
+                    except Exception as e:
+                        job["failed"] += 1
+                        print(f"Broadcast {job['id']} failed for contact {key}: {str(e)}")
+                job["position"] += len(batch)
+                await asyncio.to_thread(self.save, dict(job))
+                await asyncio.sleep(max(0.0, len(batch) / self.rate - (time.monotonic() - started)))
+            job["state"] = "finished"
+        except asyncio.CancelledError:
+            if not self.pausing:
+                job["state"] = "cancelled"
+        finally:
+            if job["state"] == "running":
+                self.save(job)
+                print(f"Broadcast {job['id']} paused at {job['position']}/{len(job['recipients'])}")
+            else:
+                job["finished_at"] = time.time()
+                self.save(job)
+                print(f"Broadcast {job['id']} {job['state']}: {self.summary(job)}")
+                await self.report(job)
+
+    async def send(self, key: str, message: str):
+        address = self.bot.contact_address(key)
+        if not address:
+            raise ValueError("unknown contact")
+        ws = self.bot.ws_for(key)
+        if not ws:
+            raise ValueError("no WebSocket connection for contact")
+        contents = [text_content(chunk) for chunk in self.bot.shaper.split(message)]
+        await send_contents(address[1], contents, ws)
+
+    async def report(self, job: Dict):
+        admin = job["started_by"]
+        if self.bot.contact_address(admin):
+            await self.bot.safe_send_message(
+                admin, f"!2 Broadcast {job['id']} {job['state'].capitalize()}!\n{self.summary(job)}", self.bot.ws_for(admin)
+            )
+
+    def summary(self, job: Dict) -> str:
+        total = len(job["recipients"])
+        elapsed = (job["finished_at"] or time.time()) - job["started_at"]
+        return f"{job['position']}/{total} processed | sent {job['sent']} | failed {job['failed']} | {elapsed:.0f}s"
+
+    def status(self) -> str:
+        if not self.job:
+            return "No broadcast has been run."
+        return f"Broadcast {self.job['id']}: {self.job['state']}\n{self.summary(self.job)}"
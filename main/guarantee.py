@@ -0,0 +1,95 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict
+from api.api import download_guarantee
+
+EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "text/html": ".html",
+    "text/plain": ".txt",
+    "application/json": ".json"
+}
+
+class GuaranteeCache:
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.downloads: Dict[str, asyncio.Task] = {}
+        os.makedirs(self.directory, exist_ok=True)
+        self.index: Dict[str, Dict] = self.load_index()
+
+    def load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(temp_path, self.index_path)
+
+    def file_path(self, entry: Dict) -> str:
+        return os.path.join(self.directory, entry["sha256"] + entry["ext"])
+
+    async def get(self, order_id: str) -> str:
+        entry = self.index.get(order_id)
+        if entry and os.path.exists(self.file_path(entry)):
+            entry["used_at"] = time.time()
+            return self.file_path(entry)
+        task = self.downloads.get(order_id)
+        if not task:
+            task = asyncio.create_task(self.download(order_id))
+            self.downloads[order_id] = task
+            task.add_done_callback(lambda _: self.downloads.pop(order_id, None))
+        return await asyncio.shield(task)
+
+    async def download(self, order_id: str) -> str:
+        fd, temp_path = tempfile.mkstemp(suffix=".part", dir=self.directory)
+        os.close(fd)
+        try:
+            result = await download_guarantee(order_id, temp_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        entry = {
+            "sha256": result["sha256"],
+            "ext": EXTENSIONS.get(result["content_type"].split(";")[0].strip(), ".bin"),
+            "size": result["size"],
+            "used_at": time.time()
+        }
+        path = self.file_path(entry)
+        if os.path.exists(path):
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+        self.index[order_id] = entry
+        await asyncio.to_thread(self.evict_and_save, order_id)
+        return path
+
+    def evict_and_save(self, keep_order_id: str):
+        files: Dict[str, int] = {}
+        for entry in self.index.values():
+            files[self.file_path(entry)] = entry["size"]
+        total = sum(files.values())
+        for order_id, entry in sorted(self.index.items(), key=lambda item: item[1]["used_at"]):
+            if total <= self.max_bytes:
+                break
+            if order_id == keep_order_id:
+                continue
+            del self.index[order_id]
+            path = self.file_path(entry)
+            if not any(self.file_path(other) == path for other in self.index.values()):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= files.get(path, 0)
+        self.save_index()
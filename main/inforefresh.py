@@ -0,0 +1,99 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from api.api import (
+    rates_cache, reserves_for, get_volume, get_status,
+    format_rates, format_reserves, format_volume, format_status
+)
+from api.scheduler import use_background_priority
+
+RENDERERS: Dict[str, Callable[[Any], str]] = {
+    "rates": lambda data: "!2 Exchange Rates!\n\nCurrent Rates (Dynamic):\n" + format_rates(data),
+    "reserves": lambda data: "!2 Currency Reserves!\n\nAvailable Reserves:\n" + format_reserves(data),
+    "volume": lambda data: "!2 24-Hour Trading Volume!\n\nTrading Activity:\n" + format_volume(data),
+    "status": lambda data: "!2 Network Status!\n\nCurrent Network Conditions:\n" + format_status(data)
+}
+
+UNAVAILABLE = {
+    "rates": "No rates data received from API",
+    "reserves": "No reserves data received from API",
+    "volume": "Volume data unavailable",
+    "status": "Status data unavailable"
+}
+
+class InfoRefresher:
+    def __init__(self, interval: float = 30.0, on_demand_cooldown: float = 10.0):
+        self.interval = interval
+        self.on_demand_cooldown = on_demand_cooldown
+        self.data: Dict[str, Any] = {}
+        self.rendered: Dict[str, str] = {}
+        self.refreshed_at: Optional[float] = None
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.rates_listeners: List[Callable[[Dict], Awaitable[None]]] = []
+
+    def add_rates_listener(self, listener: Callable[[Dict], Awaitable[None]]):
+        self.rates_listeners.append(listener)
+
+    def start(self):
+        asyncio.create_task(self.run())
+
+    async def run(self):
+        use_background_priority()
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"Info refresh failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self):
+        if not self.refresh_task or self.refresh_task.done():
+            self.refresh_task = asyncio.create_task(self.fetch_all())
+        await asyncio.shield(self.refresh_task)
+
+    async def fetch_all(self):
+        rates, flat_rates, volume, status = await asyncio.gather(
+            rates_cache.get("dynamic", max_age=self.interval / 2),
+            rates_cache.get("flat", max_age=self.interval / 2),
+            get_volume(), get_status(),
+            return_exceptions=True
+        )
+        if isinstance(flat_rates, Exception):
+            print(f"Info refresh: flat rates unavailable: {str(flat_rates)}")
+        if isinstance(rates, Exception):
+            print(f"Info refresh: rates unavailable: {str(rates)}")
+        elif rates:
+            if self.publish("rates", rates):
+                await self.notify_rates(rates)
+            self.publish("reserves", reserves_for(rates))
+        if volume and not isinstance(volume, Exception):
+            self.publish("volume", volume)
+        if status and not isinstance(status, Exception):
+            self.publish("status", status)
+        self.refreshed_at = time.monotonic()
+
+    async def notify_rates(self, rates: Dict):
+        for listener in self.rates_listeners:
+            try:
+                await listener(rates)
+            except Exception as e:
+                print(f"Rates listener failed: {str(e)}")
+
+    def publish(self, name: str, data: Any) -> bool:
+        if self.data.get(name) == data:
+            return False
+        self.data[name] = data
+        self.rendered[name] = RENDERERS[name](data)
+        return True
+
+    def may_refresh(self) -> bool:
+        if self.refresh_task and not self.refresh_task.done():
+            return True
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at >= self.on_demand_cooldown
+
+    async def render(self, name: str) -> str:
+        if name not in self.rendered and self.may_refresh():
+            await self.refresh()
+        if name not in self.rendered:
+            raise ValueError(UNAVAILABLE[name])
+        return self.rendered[name]
@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+TERMINAL_STATES = {"COMPLETE", "CANCELLED", "REFUNDED"}
+
+class OrderIndex:
+    def __init__(self, max_per_user: int = 50):
+        self.max_per_user = max_per_user
+        self.orders: Dict[str, "OrderedDict[str, Dict]"] = {}
+
+    def add(self, user: str, order_id: str, from_currency: str, to_currency: str, mode: str):
+        user_orders = self.orders.setdefault(user, OrderedDict())
+        user_orders[order_id] = {
+            "from_currency": from_currency,
+            "to_currency": to_currency,
+            "mode": mode,
+            "created": time.time(),
+            "state": "CREATED"
+        }
+        user_orders.move_to_end(order_id)
+        while len(user_orders) > self.max_per_user:
+            user_orders.popitem(last=False)
+
+    def remove(self, user: str, order_id: str):
+        user_orders = self.orders.get(user)
+        if user_orders and user_orders.pop(order_id, None) is not None and not user_orders:
+            del self.orders[user]
+
+    def mark_state(self, user: str, order_id: str, state: str):
+        entry = self.orders.get(user, {}).get(order_id)
+        if entry:
+            entry["state"] = state
+
+    def for_user(self, user: str) -> List[str]:
+        return list(self.orders.get(user, {}))
+
+    def open_orders(self, user: str) -> List[str]:
+        return [
+            order_id for order_id, entry in self.orders.get(user, {}).items()
+            if entry["state"] not in TERMINAL_STATES
+        ]
+
+    def snapshot(self) -> Dict:
+        return {user: list(user_orders.items()) for user, user_orders in self.orders.items()}
+
+    def restore(self, state: Dict):
+        for user, items in state.items():
+            self.orders[user] = OrderedDict((order_id, entry) for order_id, entry in items)
+
+    def entry(self, user: str, order_id: str) -> Dict:
+        return self.orders.get(user, {}).get(order_id, {})
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Dict
+from api.api import get_order_status
+
+def address_ready(order_info: Dict) -> bool:
+    from_addr = order_info.get("from_addr")
+    return bool(from_addr) and from_addr != "_GENERATING_"
+
+def order_ready(order_info: Dict) -> bool:
+    return address_ready(order_info) and bool(order_info.get("min_input")) and bool(order_info.get("max_input"))
+
+class OrderWaiter:
+    def __init__(self, bot, timeout: float = 45.0, first_interval: float = 0.5, max_interval: float = 3.0):
+        self.bot = bot
+        self.timeout = timeout
+        self.first_interval = first_interval
+        self.max_interval = max_interval
+
+    async def wait_until_ready(self, order_id: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        interval = self.first_interval
+        tracker = self.bot.transaction_tracker
+        try:
+            order_info = None
+            while True:
+                try:
+                    order_info = await get_order_status(order_id, max_age=0)
+                except Exception as e:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        if order_info is None:
+                            raise
+                        return order_info
+                    print(f"Error polling order {order_id} while waiting for it to be ready: {str(e)}")
+                    await asyncio.sleep(min(interval, remaining))
+                    interval = min(interval * 1.5, self.max_interval)
+                    continue
+                tracker.observe(order_id, order_info)
+                while True:
+                    remaining = deadline - loop.time()
+                    if order_ready(order_info) or remaining <= 0:
+                        return order_info
+                    try:
+                        order_info = await asyncio.wait_for(tracker.next_observation(order_id), min(interval, remaining))
+                    except asyncio.TimeoutError:
+                        break
+                interval = min(interval * 1.5, self.max_interval)
+        finally:
+            tracker.prune_observers(order_id)
@@ -0,0 +1,82 @@
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+class Profiler:
+    def __init__(self, output_dir: str, default_duration: float = 30.0, max_duration: float = 300.0):
+        self.output_dir = output_dir
+        self.default_duration = default_duration
+        self.max_duration = max_duration
+        self.active = False
+        self.command_stats: Dict[str, Dict[str, float]] = {}
+
+    def install_signal_handler(self):
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGUSR1, lambda: asyncio.create_task(self.capture_from_signal()))
+            print(f"Profiler: send SIGUSR1 to pid {os.getpid()} for a {self.default_duration:.0f}s capture")
+        except NotImplementedError:
+            pass
+
+    async def capture_from_signal(self):
+        try:
+            await self.capture()
+        except Exception as e:
+            print(f"Profiler capture failed: {str(e)}")
+
+    def record_command(self, command: str, elapsed: float):
+        if not self.active:
+            return
+        stats = self.command_stats.setdefault(command, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+
+    async def capture(self, duration: Optional[float] = None) -> str:
+        if self.active:
+            raise ValueError("A profiler capture is already running")
+        duration = min(duration or self.default_duration, self.max_duration)
+        self.active = True
+        self.command_stats = {}
+        profile = cProfile.Profile()
+        print(f"Profiler capture started for {duration:.0f}s")
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profile.disable()
+            self.active = False
+        path = self.write_report(profile, time.perf_counter() - started)
+        print(f"Profiler capture written to {path}")
+        return path
+
+    def write_report(self, profile: cProfile.Profile, elapsed: float) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        profile.dump_stats(base + ".prof")
+
+        lines = [f"Profile capture: {elapsed:.1f}s wall time", "", "Per-command timing:"]
+        if not self.command_stats:
+            lines.append("  no commands executed")
+        for command, stats in sorted(self.command_stats.items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"  {command}: {stats['count']:.0f} calls, total {stats['total']:.3f}s, "
+                f"avg {stats['total'] / stats['count']:.3f}s, max {stats['max']:.3f}s"
+            )
+
+        buffer = io.StringIO()
+        pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(40)
+        lines.extend(["", "Top functions by cumulative time:", buffer.getvalue()])
+
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        return base + ".txt"
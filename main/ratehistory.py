@@ -0,0 +1,134 @@
+import asyncio
+import bisect
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, Optional
+
+RECORD = struct.Struct("dd")
+WINDOW_PATTERN = re.compile(r"^(\d+)([mhd])$")
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def parse_window(window: str) -> int:
+    match = WINDOW_PATTERN.match(window.lower())
+    if not match:
+        raise ValueError("Window must look like 30m, 6h or 7d")
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+class RateHistory:
+    def __init__(self, directory: str, resolution: float = 60.0, retention: float = 30 * 86400,
+                 coarse_after: float = 86400, coarse_resolution: float = 900, compact_interval: float = 3600):
+        self.directory = directory
+        self.resolution = resolution
+        self.retention = retention
+        self.coarse_after = coarse_after
+        self.coarse_resolution = coarse_resolution
+        self.compact_interval = compact_interval
+        self.last_appended: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, pair: str) -> str:
+        return os.path.join(self.directory, f"{pair}.bin")
+
+    def start(self):
+        asyncio.create_task(self.run_compaction())
+
+    async def on_rates(self, rates: Dict):
+        await asyncio.to_thread(self.append_snapshot, rates, time.time())
+
+    def append_snapshot(self, rates: Dict, timestamp: float):
+        with self.lock:
+            for pair, info in rates.items():
+                if timestamp - self.last_appended.get(pair, 0) < self.resolution:
+                    continue
+                with open(self.path(pair), "ab") as f:
+                    f.write(RECORD.pack(timestamp, float(info["rate"])))
+                self.last_appended[pair] = timestamp
+
+    def load(self, pair: str) -> Optional[memoryview]:
+        path = self.path(pair)
+        if not os.path.exists(path) or os.path.getsize(path) < RECORD.size:
+            return None
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        usable = len(mapped) - len(mapped) % RECORD.size
+        return memoryview(mapped)[:usable].cast("d")
+
+    def query(self, pair: str, start: float, end: Optional[float] = None) -> Optional[Dict]:
+        values = self.load(pair)
+        if values is None:
+            return None
+        try:
+            timestamps = values[0::2]
+            lo = bisect.bisect_left(timestamps, start)
+            hi = bisect.bisect_right(timestamps, end) if end is not None else len(timestamps)
+            if lo >= hi:
+                return None
+            rates = values[2 * lo + 1:2 * hi:2]
+            return {
+                "count": hi - lo,
+                "min": min(rates),
+                "max": max(rates),
+                "avg": sum(rates) / (hi - lo),
+                "first": rates[0],
+                "last": rates[-1],
+                "last_time": timestamps[hi - 1]
+            }
+        finally:
+            values.release()
+
+    async def run_compaction(self):
+        while True:
+            await asyncio.sleep(self.compact_interval)
+            try:
+                await asyncio.to_thread(self.compact_all, time.time())
+            except Exception as e:
+                print(f"Rate history compaction failed: {str(e)}")
+
+    def compact_all(self, now: float):
+        with self.lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(".bin"):
+                    self.compact(name[:-4], now)
+
+    def compact(self, pair: str, now: float):
+        values = self.load(pair)
+        if values is None:
+            return
+        try:
+            records = array("d", values)
+        finally:
+            values.release()
+
+        keep_from = now - self.retention
+        coarse_until = now - self.coarse_after
+        compacted = array("d")
+        bucket_start, bucket_sum, bucket_count = None, 0.0, 0
+        for index in range(0, len(records), 2):
+            timestamp, rate = records[index], records[index + 1]
+            if timestamp < keep_from:
+                continue
+            bucket = timestamp - timestamp % self.coarse_resolution if timestamp < coarse_until else None
+            if bucket_count and bucket != bucket_start:
+                compacted.extend((bucket_start, bucket_sum / bucket_count))
+                bucket_sum, bucket_count = 0.0, 0
+            if bucket is None:
+                compacted.extend((timestamp, rate))
+                continue
+            bucket_start = bucket
+            bucket_sum += rate
+            bucket_count += 1
+        if bucket_count:
+            compacted.extend((bucket_start, bucket_sum / bucket_count))
+
+        if len(compacted) == len(records):
+            return
+        temp_path = self.path(pair) + ".tmp"
+        with open(temp_path, "wb") as f:
+            compacted.tofile(f)
+        os.replace(temp_path, self.path(pair))
@@ -0,0 +1,48 @@
+import asyncio
+import importlib
+import os
+import signal
+import sys
+from typing import Dict, List
+
+class CommandReloader:
+    def __init__(self, bot, package: str = "commands"):
+        self.bot = bot
+        self.package = package
+
+    def install_signal_handler(self):
+        if not hasattr(signal, "SIGHUP"):
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGHUP, self.reload_from_signal)
+            print(f"Reloader: send SIGHUP to pid {os.getpid()} to reload command modules")
+        except NotImplementedError:
+            pass
+
+    def reload_from_signal(self):
+        try:
+            modules = self.reload()
+            print(f"Reloaded {len(modules)} command module(s)")
+        except Exception as e:
+            print(f"Command reload failed, kept previous handlers: {str(e)}")
+
+    def modules(self) -> List[str]:
+        prefix = self.package + "."
+        return sorted(name for name, module in sys.modules.items() if name.startswith(prefix) and module is not None)
+
+    def reload(self) -> List[str]:
+        names = self.modules()
+        saved: Dict[str, Dict] = {name: dict(sys.modules[name].__dict__) for name in names}
+        try:
+            for name in names:
+                importlib.reload(sys.modules[name])
+            self.bot.build_commands()
+        except Exception:
+            for name, namespace in saved.items():
+                module = sys.modules[name]
+                module.__dict__.clear()
+                module.__dict__.update(namespace)
+            self.bot.build_commands()
+            raise
+        return names
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Dict, List
+
+def split_message(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for line in text.split("\n"):
+        while len(line) > max_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current, size = [], 0
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        added = len(line) + (1 if current else 0)
+        if size + added > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+            added = len(line)
+        current.append(line)
+        size += added
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+class MessageShaper:
+    def __init__(self, bot, window: float = 1.0, max_chars: int = 4000):
+        self.bot = bot
+        self.window = window
+        self.max_chars = max_chars
+        self.pending: Dict[str, List[str]] = {}
+        self.flush_tasks: Dict[str, asyncio.Task] = {}
+
+    def split(self, text: str) -> List[str]:
+        return split_message(text, self.max_chars)
+
+    def enqueue(self, sender_name: str, message: str):
+        self.pending.setdefault(sender_name, []).append(message)
+        if sender_name not in self.flush_tasks:
+            self.flush_tasks[sender_name] = asyncio.create_task(self.flush_later(sender_name))
+
+    async def flush_later(self, sender_name: str):
+        await asyncio.sleep(self.window)
+        if self.flush_tasks.get(sender_name) is asyncio.current_task():
+            del self.flush_tasks[sender_name]
+        await self.flush(sender_name)
+
+    async def flush(self, sender_name: str):
+        messages = self.pending.pop(sender_name, None)
+        if not messages:
+            return
+        await self.bot.safe_send_message(sender_name, "\n\n".join(messages), self.bot.ws_for(sender_name))
+
+    async def flush_all(self):
+        for task in list(self.flush_tasks.values()):
+            task.cancel()
+        self.flush_tasks.clear()
+        senders = list(self.pending)
+        results = await asyncio.gather(*(self.flush(sender_name) for sender_name in senders), return_exceptions=True)
+        for sender_name, result in zip(senders, results):
+            if isinstance(result, Exception):
+                print(f"Failed to flush pending messages for {sender_name}: {str(result)}")
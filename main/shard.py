@@ -0,0 +1,194 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import os
+import signal
+import sys
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from websockets import connect, serve
+from websocket.websock import connect_websocket
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONT_ONLY_COMMANDS = {"/subscribe on", "/connect"}
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+class HashRing:
+    def __init__(self, nodes: int, replicas: int = 64):
+        points = sorted((_hash(f"{node}:{replica}"), node) for node in range(nodes) for replica in range(replicas))
+        self.hashes = [point for point, _ in points]
+        self.nodes = [node for _, node in points]
+
+    def node_for(self, key) -> int:
+        index = bisect.bisect(self.hashes, _hash(str(key))) % len(self.hashes)
+        return self.nodes[index]
+
+def item_contact_id(item: Dict) -> Optional[int]:
+    return item.get("chatInfo", {}).get("contact", {}).get("contactId")
+
+def event_contact_id(response: Dict) -> Optional[int]:
+    resp = response.get("resp", {})
+    if resp.get("type") == "newChatItems" and resp.get("chatItems"):
+        return item_contact_id(resp["chatItems"][0])
+    return resp.get("contact", {}).get("contactId")
+
+def shard_state_path(path: str, shard: int) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{shard}{ext}"
+
+class ShardRouter:
+    def __init__(self, cli_port: int, worker_count: int, backlog_limit: int = 1000, shutdown_timeout: float = 70.0):
+        self.cli_port = cli_port
+        self.worker_count = worker_count
+        self.backlog_limit = backlog_limit
+        self.shutdown_timeout = shutdown_timeout
+        self.processes: Dict[int, asyncio.subprocess.Process] = {}
+        self.stopping = False
+        self.stopped = asyncio.Event()
+        self.ring = HashRing(worker_count)
+        self.cli_ws = None
+        self.worker_port = None
+        self.workers: Dict[int, object] = {}
+        self.backlogs: Dict[int, Deque[str]] = {shard: deque(maxlen=backlog_limit) for shard in range(worker_count)}
+        self.pending_commands: Dict[str, Tuple[int, str]] = {}
+        self.command_counter = 0
+
+    async def run(self):
+        server = await serve(self.handle_worker, "127.0.0.1", 0)
+        self.worker_port = server.sockets[0].getsockname()[1]
+        print(f"Shard router listening for {self.worker_count} workers on port {self.worker_port}")
+        for shard in range(self.worker_count):
+            asyncio.create_task(self.supervise_worker(shard))
+        cli = asyncio.create_task(connect_websocket(self.cli_port, self.route_event))
+        stopped = asyncio.create_task(self.stopped.wait())
+        await asyncio.wait({cli, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        cli.cancel()
+        stopped.cancel()
+        server.close()
+
+    def install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown, sig)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def request_shutdown(self, sig: Optional[signal.Signals] = None):
+        if self.stopping:
+            return
+        self.stopping = True
+        print(f"Received {sig.name if sig else 'shutdown request'}, stopping {len(self.processes)} bot worker(s)...")
+        asyncio.create_task(self.stop_workers())
+
+    async def stop_workers(self):
+        running = [process for process in self.processes.values() if process.returncode is None]
+        for process in running:
+            process.terminate()
+        _, pending = await asyncio.wait([asyncio.create_task(process.wait()) for process in running], timeout=self.shutdown_timeout)
+        if pending:
+            print(f"{len(pending)} bot worker(s) did not stop within {self.shutdown_timeout:.0f} seconds, killing")
+            for process in running:
+                if process.returncode is None:
+                    process.kill()
+        self.stopped.set()
+
+    async def supervise_worker(self, shard: int):
+        while not self.stopping:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, os.path.join(PROJECT_ROOT, "index.py"), "--worker", str(self.worker_port), str(shard),
+                cwd=PROJECT_ROOT
+            )
+            self.processes[shard] = process
+            print(f"Started bot worker {shard} (pid {process.pid})")
+            code = await process.wait()
+            if self.stopping:
+                print(f"Bot worker {shard} stopped with code {code}")
+                return
+            print(f"Bot worker {shard} exited with code {code}, restarting in 2 seconds...")
+            await asyncio.sleep(2)
+
+    async def handle_worker(self, ws):
+        hello = json.loads(await ws.recv())
+        shard = int(hello["shard"])
+        self.workers[shard] = ws
+        print(f"Bot worker {shard} connected")
+        try:
+            while self.backlogs[shard]:
+                await ws.send(self.backlogs[shard].popleft())
+            async for message in ws:
+                await self.forward_command(shard, json.loads(message))
+        finally:
+            if self.workers.get(shard) is ws:
+                del self.workers[shard]
+            print(f"Bot worker {shard} disconnected")
+
+    async def forward_command(self, shard: int, command: Dict):
+        if command.get("cmd") in FRONT_ONLY_COMMANDS:
+            return
+        if not self.cli_ws:
+            print(f"Dropping command from worker {shard}: SimpleX CLI not connected")
+            return
+        self.command_counter += 1
+        corr_id = f"w{shard}-{self.command_counter}"
+        self.pending_commands[corr_id] = (shard, command.get("corrId"))
+        await self.cli_ws.send(json.dumps({**command, "corrId": corr_id}))
+
+    async def send_to_worker(self, shard: int, response: Dict):
+        message = json.dumps(response)
+        ws = self.workers.get(shard)
+        if ws:
+            try:
+                await ws.send(message)
+                return
+            except Exception as e:
+                print(f"Failed to deliver event to worker {shard}: {str(e)}")
+        self.backlogs[shard].append(message)
+
+    async def route_event(self, response: Dict, ws):
+        self.cli_ws = ws
+        corr_id = response.get("corrId")
+        if corr_id in self.pending_commands:
+            shard, original_corr_id = self.pending_commands.pop(corr_id)
+            await self.send_to_worker(shard, {**response, "corrId": original_corr_id})
+            return
+
+        resp = response.get("resp", {})
+        if resp.get("type") == "newChatItems" and len(resp.get("chatItems") or []) > 1:
+            by_shard: Dict[int, List[Dict]] = {}
+            for item in resp["chatItems"]:
+                by_shard.setdefault(self.shard_for(item_contact_id(item)), []).append(item)
+            for shard, items in by_shard.items():
+                await self.send_to_worker(shard, {**response, "resp": {**resp, "chatItems": items}})
+            return
+
+        await self.send_to_worker(self.shard_for(event_contact_id(response)), response)
+
+    def shard_for(self, contact_id: Optional[int]) -> int:
+        return 0 if contact_id is None else self.ring.node_for(contact_id)
+
+async def run_worker(front_port: int, shard: int):
+    from config.settings import BOT_STATE_FILE, SHUTDOWN_DRAIN_TIMEOUT
+    from main.bot import Bot
+    from main.shutdown import ShutdownCoordinator
+    bot = Bot(None, shard)
+    coordinator = ShutdownCoordinator(bot, shard_state_path(BOT_STATE_FILE, shard), SHUTDOWN_DRAIN_TIMEOUT)
+    coordinator.restore()
+    coordinator.install_signal_handlers()
+    async with connect(f"ws://127.0.0.1:{front_port}") as ws:
+        await ws.send(json.dumps({"shard": shard}))
+        print(f"Bot worker {shard} connected to shard router")
+
+        async def receive():
+            async for message in ws:
+                await bot.handle_message(json.loads(message), ws)
+
+        receiver = asyncio.create_task(receive())
+        stopped = asyncio.create_task(coordinator.stopped.wait())
+        await asyncio.wait({receiver, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        receiver.cancel()
+        stopped.cancel()
+    print(f"Bot worker {shard} shut down")
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import signal
+from typing import Dict, Optional
+
+class ShutdownCoordinator:
+    def __init__(self, bot, state_path: str, drain_timeout: float = 20.0):
+        self.bot = bot
+        self.state_path = state_path
+        self.drain_timeout = drain_timeout
+        self.stopped = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    def install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request, sig)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+    def request(self, sig: Optional[signal.Signals] = None):
+        if self.task:
+            return
+        print(f"Received {sig.name if sig else 'shutdown request'}, shutting down...")
+        self.task = asyncio.create_task(self.shutdown())
+
+    async def shutdown(self):
+        try:
+            self.bot.accepting_commands = False
+            await self.drain()
+            await self.bot.broadcaster.pause()
+            await self.bot.shaper.flush_all()
+            await asyncio.to_thread(self.save, self.bot.checkpoint())
+            print(f"State checkpointed to {self.state_path}")
+        except Exception as e:
+            print(f"Error during shutdown: {str(e)}")
+        finally:
+            self.stopped.set()
+
+    async def drain(self):
+        tasks = set(self.bot.command_tasks)
+        if not tasks:
+            return
+        print(f"Waiting up to {self.drain_timeout:.0f} seconds for {len(tasks)} command(s) to finish...")
+        _, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        for task in pending:
+            print(f"Cancelling unfinished command: {task.get_name()}")
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def save(self, state: Dict):
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def restore(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Failed to read saved state {self.state_path}: {str(e)}")
+            return
+        self.bot.restore(state)
+        os.remove(self.state_path)
+        print(f"Restored state from {self.state_path}")
@@ -0,0 +1,38 @@
+import time
+from contextlib import contextmanager
+from typing import Awaitable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class StartupTimer:
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []
+        self.reported = False
+
+    def record(self, name: str, began: float):
+        self.phases.append((name, began - self.started, time.perf_counter() - began))
+
+    @contextmanager
+    def phase(self, name: str):
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, began)
+
+    async def track(self, name: str, awaitable: Awaitable[T]) -> T:
+        began = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.record(name, began)
+
+    def report(self, milestone: str = "ready"):
+        if self.reported:
+            return
+        self.reported = True
+        lines = [f"Startup timing ({milestone} after {time.perf_counter() - self.started:.2f}s):"]
+        for name, offset, duration in self.phases:
+            lines.append(f"  {name}: {duration:.3f}s (started at +{offset:.3f}s)")
+        print("\n".join(lines))
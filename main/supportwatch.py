@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Dict, List
+from api.api import get_support_messages, format_support_line, format_support_lines
+from api.scheduler import use_background_priority
+
+class SupportWatcher:
+    def __init__(self, bot, interval: float = 30.0, idle_timeout: float = 86400.0):
+        self.bot = bot
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.chats: Dict[str, Dict] = {}
+        self.syncing: Dict[str, asyncio.Task] = {}
+        asyncio.create_task(self.start_watching())
+
+    def watch(self, user: str, order_id: str) -> Dict:
+        chat = self.chats.setdefault(order_id, {"user": user, "seen": 0, "lines": [], "fetched_at": None})
+        chat["user"] = user
+        chat["last_activity"] = time.monotonic()
+        return chat
+
+    async def sync(self, order_id: str) -> List[Dict]:
+        task = self.syncing.get(order_id)
+        if not task:
+            task = asyncio.create_task(self.fetch_new(order_id))
+            self.syncing[order_id] = task
+            task.add_done_callback(lambda _: self.syncing.pop(order_id, None))
+        return await asyncio.shield(task)
+
+    async def fetch_new(self, order_id: str) -> List[Dict]:
+        chat = self.chats[order_id]
+        messages = await get_support_messages(order_id) or []
+        if len(messages) < chat["seen"]:
+            chat["seen"], chat["lines"] = 0, []
+        new_messages = messages[chat["seen"]:]
+        chat["lines"].extend(format_support_line(msg) for msg in new_messages)
+        chat["seen"] = len(messages)
+        chat["fetched_at"] = time.monotonic()
+        return new_messages
+
+    async def history(self, user: str, order_id: str) -> str:
+        chat = self.watch(user, order_id)
+        if chat["fetched_at"] is None or time.monotonic() - chat["fetched_at"] >= self.interval:
+            await self.sync(order_id)
+        return format_support_lines(chat["lines"])
+
+    async def before_send(self, user: str, order_id: str):
+        chat = self.watch(user, order_id)
+        if chat["fetched_at"] is None:
+            try:
+                await self.sync(order_id)
+            except Exception as e:
+                print(f"Error syncing support chat for order {order_id} before sending: {str(e)}")
+
+    async def message_sent(self, user: str, order_id: str, text: str):
+        chat = self.watch(user, order_id)
+        had_baseline = chat["fetched_at"] is not None
+        replies = await self.sync(order_id)
+        if not had_baseline:
+            return
+        own = next((index for index, msg in enumerate(replies) if msg.get("message") == text), None)
+        if own is not None:
+            replies = replies[:own] + replies[own + 1:]
+        if replies:
+            await self.push(chat, order_id, replies)
+
+    async def start_watching(self):
+        use_background_priority()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            for order_id, chat in list(self.chats.items()):
+                if now - chat["last_activity"] > self.idle_timeout:
+                    del self.chats[order_id]
+                    continue
+                if chat["fetched_at"] is not None and now - chat["fetched_at"] < self.interval:
+                    continue
+                try:
+                    new_messages = await self.sync(order_id)
+                except Exception as e:
+                    print(f"Error syncing support chat for order {order_id}: {str(e)}")
+                    continue
+                if new_messages:
+                    await self.push(chat, order_id, new_messages)
+
+    async def push(self, chat: Dict, order_id: str, new_messages: List[Dict]):
+        lines = [format_support_line(msg) for msg in new_messages]
+        self.bot.notify(
+            chat["user"],
+            f"!2 💬 New Support Reply for Order {order_id}!\n" + "\n".join(lines)
+        )
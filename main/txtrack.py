@@ -1,13 +1,31 @@
 import asyncio
-from typing import Dict
+import time
+from typing import Dict, List
 from api.api import get_order_status
+from api.scheduler import use_background_priority
 
 class TransactionTracker:
     def __init__(self, bot):
         self.bot = bot
         self.active_orders: Dict[str, Dict] = {}
+        self.observers: Dict[str, List[asyncio.Future]] = {}
         asyncio.create_task(self.start_tracking())
 
+    def observe(self, order_id: str, order_info: Dict):
+        for future in self.observers.pop(order_id, []):
+            if not future.done():
+                future.set_result(order_info)
+
+    def next_observation(self, order_id: str) -> asyncio.Future:
+        future = asyncio.get_event_loop().create_future()
+        self.observers.setdefault(order_id, []).append(future)
+        return future
+
+    def prune_observers(self, order_id: str):
+        pending = [future for future in self.observers.pop(order_id, []) if not future.done()]
+        if pending:
+            self.observers[order_id] = pending
+
     def add_order(self, user: str, order_id: str):
         self.active_orders[user] = {
             "order_id": order_id,
@@ -16,26 +34,55 @@ class TransactionTracker:
         }
         print(f"Started tracking order {order_id} for user {user}")
 
+    def snapshot(self) -> Dict:
+        now = asyncio.get_event_loop().time()
+        return {
+            user: {
+                "order_id": order_data["order_id"],
+                "elapsed": now - order_data["start_time"],
+                "last_state": order_data["last_state"],
+                "saved_at": time.time()
+            }
+            for user, order_data in self.active_orders.items()
+        }
+
+    def restore(self, state: Dict):
+        now = asyncio.get_event_loop().time()
+        for user, order_data in state.items():
+            elapsed = order_data["elapsed"] + max(0.0, time.time() - order_data["saved_at"])
+            self.active_orders[user] = {
+                "order_id": order_data["order_id"],
+                "start_time": now - elapsed,
+                "last_state": order_data["last_state"]
+            }
+        if state:
+            print(f"Resumed tracking {len(state)} order(s)")
+
     def remove_order(self, user: str):
         if user in self.active_orders:
             del self.active_orders[user]
             print(f"Stopped tracking orders for user {user}")
 
     async def start_tracking(self):
+        use_background_priority()
         while True:
+            if not self.bot.cli_alive():
+                print("SimpleX CLI is down, skipping tracking pass")
+                await asyncio.sleep(30)
+                continue
             for user, order_data in list(self.active_orders.items()):
                 order_id = order_data["order_id"]
                 start_time = order_data["start_time"]
                 last_state = order_data["last_state"]
                 try:
                     elapsed_time = (asyncio.get_event_loop().time() - start_time) / 60
-                    order_info = get_order_status(order_id)
+                    order_info = await get_order_status(order_id, max_age=10)
+                    self.observe(order_id, order_info)
 
                     if elapsed_time >= 30 and order_info["state"] == "AWAITING_INPUT" and not order_info.get("from_amount_received"):
-                        await self.bot.safe_send_message(
+                        self.bot.notify(
                             user,
-                            f"!1 ⚠️ Order {order_id} Removed from Tracking!\nNo funds received within 30 minutes.",
-                            self.bot.ws
+                            f"!1 ⚠️ Order {order_id} Removed from Tracking!\nNo funds received within 30 minutes."
                         )
                         self.remove_order(user)
                         print(f"Order {order_id} for user {user} removed from tracking due to no funds received")
@@ -43,36 +90,33 @@ class TransactionTracker:
 
                     if order_info["state"] != last_state:
                         order_data["last_state"] = order_info["state"]
+                        self.bot.order_index.mark_state(user, order_id, order_info["state"])
                         if order_info["state"] == "CONFIRMING_INPUT" and order_info.get("from_amount_received"):
-                            await self.bot.safe_send_message(
+                            self.bot.notify(
                                 user,
                                 f"!2 ✅ Order {order_id} - Transaction Detected!\n"
-                                f"We have detected your transaction of {order_info.get('from_amount_received', 'N/A')} {order_info.get('from_currency', 'N/A')}. Awaiting network confirmation.",
-                                self.bot.ws
+                                f"We have detected your transaction of {order_info.get('from_amount_received', 'N/A')} {order_info.get('from_currency', 'N/A')}. Awaiting network confirmation."
                             )
                             print(f"Transaction detected for order {order_id} for user {user}")
                         elif order_info["state"] == "CONFIRMING_SEND" and order_info.get("to_amount"):
-                            await self.bot.safe_send_message(
+                            self.bot.notify(
                                 user,
                                 f"!2 🚀 Order {order_id} - Transaction Confirmed & Funds Sent!\n"
-                                f"The transaction has been confirmed. We are sending you {order_info.get('to_amount', 'N/A')} {order_info.get('to_currency', 'N/A')}. Awaiting final confirmation.",
-                                self.bot.ws
+                                f"The transaction has been confirmed. We are sending you {order_info.get('to_amount', 'N/A')} {order_info.get('to_currency', 'N/A')}. Awaiting final confirmation."
                             )
                             print(f"Funds sent for order {order_id} for user {user}")
                         elif order_info["state"] == "COMPLETE" and order_info.get("transaction_id_sent"):
-                            await self.bot.safe_send_message(
+                            self.bot.notify(
                                 user,
                                 f"!2 🎉 Order {order_id} - Transaction Completed!\n"
-                                f"You have received {order_info.get('to_amount', 'N/A')} {order_info.get('to_currency', 'N/A')}! Transaction ID: {order_info.get('transaction_id_sent', 'N/A')}.",
-                                self.bot.ws
+                                f"You have received {order_info.get('to_amount', 'N/A')} {order_info.get('to_currency', 'N/A')}! Transaction ID: {order_info.get('transaction_id_sent', 'N/A')}."
                             )
                             print(f"Exchange completed for order {order_id} for user {user}")
                             self.remove_order(user)
                         elif order_info["state"] in ["CANCELLED", "REFUNDED"]:
-                            await self.bot.safe_send_message(
+                            self.bot.notify(
                                 user,
-                                f"!1 ⚠️ Order {order_id} {order_info['state']}!\nThe order has been {order_info['state'].lower()}.",
-                                self.bot.ws
+                                f"!1 ⚠️ Order {order_id} {order_info['state']}!\nThe order has been {order_info['state'].lower()}."
                             )
                             self.remove_order(user)
                             print(f"Order {order_id} for user {user} {order_info['state'].lower()}")
@@ -80,9 +124,8 @@ class TransactionTracker:
                             print(f"Order {order_id} for user {user} in state {order_info['state']}")
                 except Exception as e:
                     print(f"Error tracking order {order_id} for user {user}: {str(e)}")
-                    await self.bot.safe_send_message(
+                    self.bot.notify(
                         user,
-                        f"!1 ⚠️ Error Tracking Order {order_id}: {str(e)}!\nPlease check the order status manually with !2 /order {order_id}!",
-                        self.bot.ws
+                        f"!1 ⚠️ Error Tracking Order {order_id}: {str(e)}!\nPlease check the order status manually with !2 /order {order_id}!"
                     )
             await asyncio.sleep(30)
\ No newline at end of file
@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+class LoopWatchdog:
+    def __init__(self, threshold: float = 1.0, interval: float = 0.25):
+        self.threshold = threshold
+        self.interval = interval
+        self.last_tick = time.monotonic()
+        self.stall_count = 0
+        self.longest_stall = 0.0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        asyncio.create_task(self.heartbeat())
+        threading.Thread(target=self.watch, name="loop-watchdog", daemon=True).start()
+        print(f"Event loop watchdog started (threshold {self.threshold:.2f}s)")
+
+    def stop(self):
+        self.stopped.set()
+
+    async def heartbeat(self):
+        while not self.stopped.is_set():
+            self.last_tick = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def watch(self):
+        reported_tick = None
+        while not self.stopped.wait(self.interval):
+            last_tick = self.last_tick
+            stalled_for = time.monotonic() - last_tick - self.interval
+            if stalled_for < self.threshold:
+                continue
+            if reported_tick == last_tick:
+                self.longest_stall = max(self.longest_stall, stalled_for)
+                continue
+            reported_tick = last_tick
+            self.stall_count += 1
+            self.longest_stall = max(self.longest_stall, stalled_for)
+            self.report(stalled_for)
+
+    def running_task_name(self) -> str:
+        try:
+            task = asyncio.current_task(self.loop)
+        except RuntimeError:
+            task = None
+        return task.get_name() if task else "no task (loop callback)"
+
+    def report(self, stalled_for: float):
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame else "stack unavailable\n"
+        print(
+            f"Event loop stalled for {stalled_for:.2f}s (stall #{self.stall_count})\n"
+            f"Running: {self.running_task_name()}\n"
+            f"Loop thread stack:\n{stack}"
+        )
@@ -0,0 +1,55 @@
+import asyncio
+from collections import deque
+from typing import Deque
+
+class AdmissionController:
+    def __init__(self, max_in_flight: int = 20, max_queue: int = 20, queue_timeout: float = 2.0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+            self.admitted += 1
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done():
+                self.release()
+            else:
+                future.cancel()
+                self.waiters.remove(future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.shed += 1
+            return False
+
+    def release(self):
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "admitted": self.admitted,
+            "shed": self.shed
+        }
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+WORK_DIR = tempfile.mkdtemp(prefix="replay-")
+for name, value in {
+    "API_BASE_URL": "http://replay.invalid",
+    "API_MAX_RPS": "0",
+    "RATES_SNAPSHOT_DIR": "",
+    "PROFILE_DIR": os.path.join(WORK_DIR, "profiles"),
+    "RATE_HISTORY_DIR": os.path.join(WORK_DIR, "rate_history"),
+    "GUARANTEE_DIR": os.path.join(WORK_DIR, "guarantees"),
+    "BROADCAST_STATE_FILE": os.path.join(WORK_DIR, "broadcast.json"),
+    "BOT_STATE_FILE": os.path.join(WORK_DIR, "bot_state.json")
+}.items():
+    os.environ[name] = value
+
+import api.api as api
+from main.bot import Bot
+
+PRICES = {"BTC": 60000, "BTCLN": 60000, "DAI": 1, "DASH": 30, "ETH": 3000, "LTC": 80, "USDC": 1, "USDT": 1, "XMR": 150}
+SEND_TARGET = re.compile(r"^(?:/_send @(\d+)|/(?:img|file) @'?([^' ]+)|@'?([^' ]+))")
+
+class StubResponse:
+    def __init__(self, data):
+        self.data = data
+        self.status_code = 200
+        self.headers = {"Content-Type": "application/json"}
+        self.content = json.dumps(data).encode()
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+class StubApi:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.orders: Dict[str, Dict] = {}
+        self.rates = {
+            f"{a}_{b}": {"rate": str(PRICES[a] / PRICES[b]), "reserve": str(1000000 / PRICES[b]), "svc_fee": "0.5"}
+            for a in PRICES for b in PRICES if a != b
+        }
+
+    def install(self):
+        api._send = self.send
+        api._download = self.download
+
+    async def send(self, method: str, path: str, params: Dict) -> StubResponse:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return StubResponse(self.respond(path, params))
+
+    def respond(self, path: str, params: Dict):
+        if path == "/rates":
+            return self.rates
+        if path == "/volume":
+            return {currency: "1000" for currency in PRICES}
+        if path == "/status":
+            return {currency: {"status": "online"} for currency in PRICES}
+        if path == "/create":
+            order_id = f"replay{len(self.orders) + 1:06d}"
+            self.orders[order_id] = {
+                "orderid": order_id,
+                "state": "AWAITING_INPUT",
+                "from_currency": params["from_currency"],
+                "to_currency": params["to_currency"],
+                "to_addr": params["to_address"],
+                "from_addr": f"replay-deposit-{order_id}",
+                "min_input": "0.001",
+                "max_input": "10",
+                "rate": self.rates.get(f"{params['from_currency']}_{params['to_currency']}", {}).get("rate", "1"),
+                "svc_fee": "0.5",
+                "rate_mode": params.get("rate_mode", "dynamic")
+            }
+            return {"orderid": order_id}
+        if path == "/order/support_messages":
+            return []
+        if path == "/order":
+            return self.orders.get(params["orderid"]) or {"error": "ORDER_NOT_FOUND"}
+        return {"result": True}
+
+    async def download(self, path: str, params: Dict, dest_path: str) -> Dict:
+        self.calls += 1
+        with open(dest_path, "wb") as f:
+            f.write(b"replay guarantee letter\n")
+        return {"content_type": "text/plain", "sha256": params["orderid"], "size": 24}
+
+class ReplaySocket:
+    def __init__(self):
+        self.sent = 0
+        self.pending: Dict[str, List[float]] = {}
+        self.latencies: List[float] = []
+
+    def expect(self, contact_id: int, name: str):
+        self.pending.setdefault(str(contact_id), []).append(time.perf_counter())
+        self.pending.setdefault(name, self.pending[str(contact_id)])
+
+    async def send(self, message: str):
+        self.sent += 1
+        match = SEND_TARGET.match(json.loads(message)["cmd"])
+        if not match:
+            return
+        waiting = self.pending.get(next(group for group in match.groups() if group))
+        if waiting:
+            self.latencies.append(time.perf_counter() - waiting.pop(0))
+
+def read_log(path: str) -> List[Dict]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def incoming_message(frame: Dict):
+    resp = frame.get("resp", {})
+    if resp.get("type") != "newChatItems" or not resp.get("chatItems"):
+        return None
+    item = resp["chatItems"][0]
+    if item.get("chatItem", {}).get("chatDir", {}).get("type") != "directRcv":
+        return None
+    contact = item["chatInfo"]["contact"]
+    return contact["contactId"], contact["localDisplayName"]
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def replay(path: str, speed: float, latency: float, antispam: bool, drain_timeout: float):
+    log = read_log(path)
+    records = [record for record in log if record["dir"] == "in"]
+    recorded_out = len(log) - len(records)
+    stub = StubApi(latency)
+    stub.install()
+    ws = ReplaySocket()
+    bot = Bot(ws)
+    if not antispam:
+        bot.anti_spam.cooldown_time = 0
+
+    started = time.perf_counter()
+    first = records[0]["t"] if records else 0.0
+    for record in records:
+        if speed > 0:
+            delay = (record["t"] - first) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        frame = record["frame"]
+        message = incoming_message(frame)
+        if message:
+            ws.expect(*message)
+        await bot.handle_message(frame, ws)
+    fed = time.perf_counter() - started
+    if bot.command_tasks:
+        await asyncio.wait(set(bot.command_tasks), timeout=drain_timeout)
+    await bot.shaper.flush_all()
+    elapsed = time.perf_counter() - started
+
+    print("\nReplay Report")
+    print(f"Log: {path}")
+    print(f"Speed: {'maximum' if speed <= 0 else f'{speed:g}x'} | stub API latency {latency * 1000:.0f}ms")
+    print(f"Events: {len(records)} fed in {fed:.2f}s, completed in {elapsed:.2f}s ({len(records) / max(elapsed, 1e-9):.1f} events/s)")
+    print(f"Commands sent: {ws.sent} (recorded session: {recorded_out}) | API calls: {stub.calls}")
+    if ws.latencies:
+        print(
+            f"Reply latency over {len(ws.latencies)} message(s): "
+            f"p50 {percentile(ws.latencies, 0.5) * 1000:.1f}ms | p95 {percentile(ws.latencies, 0.95) * 1000:.1f}ms | "
+            f"p99 {percentile(ws.latencies, 0.99) * 1000:.1f}ms | max {max(ws.latencies) * 1000:.1f}ms"
+        )
+    unanswered = sum(len(waiting) for key, waiting in ws.pending.items() if key.isdigit())
+    if unanswered:
+        print(f"Unanswered messages: {unanswered}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded SimpleX event log against the bot with stubbed exch.cx APIs.")
+    parser.add_argument("log", help="events-*.jsonl.gz file written by the event recorder")
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = original timing, N = N times faster, 0 = as fast as possible")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="simulated API latency in milliseconds")
+    parser.add_argument("--antispam", action="store_true", help="keep the per-user command cooldown enabled")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="seconds to wait for in-flight commands after the last event")
+    args = parser.parse_args()
+    asyncio.run(replay(args.log, args.speed, args.api_latency / 1000, args.antispam, args.drain_timeout))
+
+if __name__ == "__main__":
+    main()
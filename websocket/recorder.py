@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Dict, Optional
+from api.api import ADDRESS_PATTERNS
+
+PROFILE_KEYS = {"localDisplayName", "displayName", "fullName"}
+DROPPED_KEYS = {"image", "contactLink"}
+TEXT_KEYS = {"text", "itemText"}
+ADDRESS_TOKEN = re.compile("|".join(
+    f"(?<![A-Za-z0-9])(?:{pattern[1:-1]})(?![A-Za-z0-9])" for pattern in sorted(set(ADDRESS_PATTERNS.values()))
+))
+ORDER_ID_TOKEN = re.compile(
+    r"((?:/(?:order|fetch_guarantee|revalidate_address|remove_order|refund|refund_confirm|support_messages?)\s+"
+    r"|Order(?: ID:)?\s+`?|/order/|`))(?!(?:addr|order|user)-)(?=[A-Za-z_-]*\d)([A-Za-z0-9_-]+)"
+)
+SEND_JSON = re.compile(r"^(/_send \S+ json )(.*)$", re.S)
+
+class EventRecorder:
+    def __init__(self, path: str, anonymize_key: str = ""):
+        self.path = path
+        self.key = anonymize_key.encode() if anonymize_key else None
+        self.aliases: Dict[str, str] = {}
+        self.started = time.monotonic()
+        self.lines: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self.recorded = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self.write, name="event-recorder", daemon=True)
+        self.thread.start()
+        print(f"Recording events to {path}{' (anonymized)' if self.key else ''}")
+
+    def pseudonym(self, prefix: str, value: str) -> str:
+        return f"{prefix}-" + hmac.new(self.key, value.encode(), hashlib.sha256).hexdigest()[:12]
+
+    def alias(self, name: str) -> str:
+        if name not in self.aliases:
+            self.aliases[name] = self.pseudonym("user", name)
+        return self.aliases[name]
+
+    def redact_text(self, text: str) -> str:
+        text = ADDRESS_TOKEN.sub(lambda match: self.pseudonym("addr", match.group(0)), text)
+        return ORDER_ID_TOKEN.sub(lambda match: match.group(1) + self.pseudonym("order", match.group(2)), text)
+
+    def anonymize_value(self, key: str, item):
+        if isinstance(item, str):
+            if key in PROFILE_KEYS:
+                return self.alias(item)
+            if key in TEXT_KEYS:
+                return self.redact_text(item)
+        return self.anonymize(item)
+
+    def anonymize(self, value):
+        if isinstance(value, dict):
+            return {
+                key: self.anonymize_value(key, item)
+                for key, item in value.items() if key not in DROPPED_KEYS
+            }
+        if isinstance(value, list):
+            return [self.anonymize(item) for item in value]
+        return value
+
+    def anonymize_command(self, cmd: str) -> str:
+        for name, alias in self.aliases.items():
+            cmd = cmd.replace(f"@'{name}'", f"@{alias}").replace(f"@{name} ", f"@{alias} ")
+        match = SEND_JSON.match(cmd)
+        if match:
+            try:
+                return match.group(1) + json.dumps(self.anonymize(json.loads(match.group(2))), ensure_ascii=False)
+            except ValueError:
+                pass
+        return self.redact_text(cmd)
+
+    def record(self, direction: str, port: int, frame: Dict):
+        if self.key:
+            frame = self.anonymize(frame)
+            if direction == "out" and isinstance(frame.get("cmd"), str):
+                frame["cmd"] = self.anonymize_command(frame["cmd"])
+        self.recorded += 1
+        self.lines.put(json.dumps({
+            "t": round(time.monotonic() - self.started, 6),
+            "ts": time.time(),
+            "dir": direction,
+            "port": port,
+            "frame": frame
+        }, ensure_ascii=False))
+
+    def write(self):
+        with gzip.open(self.path, "at", encoding="utf-8") as f:
+            while True:
+                line = self.lines.get()
+                if line is None:
+                    return
+                f.write(line + "\n")
+                if self.lines.empty():
+                    f.flush()
+
+    def close(self):
+        self.lines.put(None)
+        self.thread.join(timeout=5)
+        print(f"Recorded {self.recorded} frame(s) to {self.path}")
+
+class RecordingSocket:
+    def __init__(self, ws, recorder: EventRecorder, port: int):
+        self.ws = ws
+        self.recorder = recorder
+        self.port = port
+
+    async def send(self, message: str):
+        self.recorder.record("out", self.port, json.loads(message))
+        await self.ws.send(message)
+
+    def __getattr__(self, name):
+        return getattr(self.ws, name)
@@ -1,34 +1,33 @@
 import asyncio
 import json
 import random
-import socket
+from typing import Dict, List
 from websockets import connect
+from websockets.exceptions import ConnectionClosed
+from websocket.recorder import RecordingSocket
 
 async def wait_for_port(port: int, timeout: int = 60000) -> bool:
     start_time = asyncio.get_event_loop().time()
     while True:
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect(("127.0.0.1", port))
-            sock.close()
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
             return True
-        except Exception:
+        except OSError:
             if asyncio.get_event_loop().time() - start_time > timeout / 1000:
                 raise ValueError(f"Port {port} not available after {timeout}ms")
-            await asyncio.sleep(1)
+            await asyncio.sleep(0.1)
 
-async def send_message(sender_name: str, message_content: str, ws):
-    corr_id = f"id{random.randint(0, 999999)}"
-    escaped_name = f"'{sender_name}'" if " " in sender_name else sender_name
-    cmd = f"@{escaped_name} {message_content}"
-    message = json.dumps({"corrId": corr_id, "cmd": cmd})
-    print(f"Sending: {message}")
-    await ws.send(message)
+def text_content(text: str) -> Dict:
+    return {"msgContent": {"type": "text", "text": text}}
 
-async def send_image(sender_name: str, file_path: str, ws):
+def file_content(file_path: str, text: str = "") -> Dict:
+    return {"fileSource": {"filePath": file_path}, "msgContent": {"type": "file", "text": text}}
+
+async def send_contents(contact_id: int, contents: List[Dict], ws):
     corr_id = f"id{random.randint(0, 999999)}"
-    escaped_name = f"'{sender_name}'" if " " in sender_name else sender_name
-    cmd = f"/img @{escaped_name} {file_path}"
+    cmd = f"/_send @{contact_id} json {json.dumps(contents, ensure_ascii=False)}"
     message = json.dumps({"corrId": corr_id, "cmd": cmd})
     print(f"Sending: {message}")
     await ws.send(message)
@@ -42,14 +41,25 @@ async def get_invitation_link(ws):
     await ws.send(json.dumps({"corrId": corr_id, "cmd": "/connect"}))
     print("Requested invitation link...")
 
-async def connect_websocket(port: int, message_handler):
-    await wait_for_port(port)
-    async with connect(f"ws://localhost:{port}") as ws:
-        print("WebSocket connected")
-        await subscribe_to_events(ws)
-        await get_invitation_link(ws)
-
-        async for message in ws:
-            response = json.loads(message)
-            print(f"Received: {response}")
-            await message_handler(response, ws)
\ No newline at end of file
+async def connect_websocket(port: int, message_handler, reconnect: bool = True, recorder=None):
+    while True:
+        await wait_for_port(port)
+        try:
+            async with connect(f"ws://localhost:{port}") as connection:
+                print("WebSocket connected")
+                ws = RecordingSocket(connection, recorder, port) if recorder else connection
+                await subscribe_to_events(ws)
+                await get_invitation_link(ws)
+
+                async for message in connection:
+                    response = json.loads(message)
+                    print(f"Received: {response}")
+                    if recorder:
+                        recorder.record("in", port, response)
+                    await message_handler(response, ws)
+        except (OSError, ConnectionClosed) as e:
+            print(f"WebSocket connection lost: {str(e)}")
+        if not reconnect:
+            return
+        print("Reconnecting WebSocket in 2 seconds...")
+        await asyncio.sleep(2)